@@ -0,0 +1,103 @@
+#-*- coding: utf-8 -*-
+
+import io
+import csv
+import random
+import datetime
+import itertools
+
+from django.db import connections, transaction
+
+__all__ = ['rows', 'generate']
+
+
+_COLUMNS = ('title', 'date', 'date_unique', 'is_pinned', 'is_sticky')
+
+
+def rows(
+        size, seed=0, duplicates=10, pinned=0.01, sticky=0.05, start=None):
+    """
+    Yield ``size`` reproducible ``Article`` rows as tuples of
+    ``(title, date, date_unique, is_pinned, is_sticky)``.
+    Each ``date`` is shared by ``duplicates`` rows; ``pinned``
+    and ``sticky`` are the fraction of rows with those flags
+    """
+    assert duplicates > 0
+    rng = random.Random(seed)
+    start = start or datetime.datetime(
+        2020, 1, 1, tzinfo=datetime.timezone.utc)
+    for i in range(size):
+        yield (
+            "%s" % i,
+            start + datetime.timedelta(seconds=i // duplicates),
+            start + datetime.timedelta(microseconds=i),
+            rng.random() < pinned,
+            rng.random() < sticky)
+
+
+def _batches(iterable, batch_size):
+    iterable = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterable, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _copy(connection, table, rows, batch_size):
+    sql = 'COPY %s (%s) FROM STDIN WITH (FORMAT csv)' % (
+        connection.ops.quote_name(table),
+        ', '.join(connection.ops.quote_name(c) for c in _COLUMNS))
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if not hasattr(raw, 'copy_expert'):  # psycopg 3
+            with raw.copy(sql.replace('csv', 'text')) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            return
+        for batch in _batches(rows, batch_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(
+                (title, date.isoformat(), date_unique.isoformat(),
+                 't' if is_pinned else 'f', 't' if is_sticky else 'f')
+                for title, date, date_unique, is_pinned, is_sticky in batch)
+            buffer.seek(0)
+            raw.copy_expert(sql, buffer)
+
+
+def _executemany(connection, table, fields, rows, batch_size):
+    adapters = [
+        connection.ops.adapt_datetimefield_value
+        if field.get_internal_type() == 'DateTimeField' else None
+        for field in fields]
+    sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+        connection.ops.quote_name(table),
+        ', '.join(connection.ops.quote_name(c) for c in _COLUMNS),
+        ', '.join(['%s'] * len(_COLUMNS)))
+    with connection.cursor() as cursor:
+        for batch in _batches(rows, batch_size):
+            cursor.executemany(sql, [
+                tuple(
+                    adapt(value) if adapt else value
+                    for adapt, value in zip(adapters, row))
+                for row in batch])
+
+
+def generate(size, batch_size=10_000, using='default', **kwargs):
+    """
+    Insert ``size`` rows (see ``rows()`` for the ``kwargs``)
+    in a single transaction, keeping up to ``batch_size``
+    rows in memory. It uses ``COPY`` on PostgreSQL, and
+    ``executemany`` on any other database
+    """
+    from tests.models import Article
+    connection = connections[using]
+    table = Article._meta.db_table
+    fields = [Article._meta.get_field(c) for c in _COLUMNS]
+    data = rows(size, **kwargs)
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            _copy(connection, table, data, batch_size)
+        else:
+            _executemany(connection, table, fields, data, batch_size)
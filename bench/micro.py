@@ -0,0 +1,136 @@
+#-*- coding: utf-8 -*-
+
+import gc
+import time
+import tracemalloc
+
+from django.db import models
+
+from infinite_scroll_pagination import serializers
+from infinite_scroll_pagination.paginator import (
+    SeekPaginator, SeekPage, NEXT_PAGE, ROW_VALUES_FILTER)
+
+__all__ = [
+    'MAX_FIELDS',
+    'run']
+
+
+MAX_FIELDS = 8
+
+
+class BenchRow(models.Model):
+    """Never queried; it only needs to compile"""
+    f0 = models.IntegerField()
+    f1 = models.IntegerField()
+    f2 = models.IntegerField()
+    f3 = models.IntegerField()
+    f4 = models.IntegerField()
+    f5 = models.IntegerField()
+    f6 = models.IntegerField()
+    f7 = models.IntegerField()
+
+    class Meta:
+        app_label = 'tests'
+        managed = False
+
+
+def _operations(fields):
+    lookup_field = tuple('-f%d' % i for i in range(fields))
+    value = tuple(range(fields))
+    pk = 1
+    paginator = SeekPaginator(
+        BenchRow.objects.all(), per_page=20, lookup_field=lookup_field)
+    row_values_paginator = SeekPaginator(
+        BenchRow.objects.all(), per_page=20, lookup_field=lookup_field,
+        filter_strategy=ROW_VALUES_FILTER)
+    page = SeekPage(
+        query_set=None,
+        key={'value': value, 'pk': pk},
+        move_to=NEXT_PAGE,
+        paginator=paginator)
+    page._object_list = [
+        BenchRow(pk=i, **{'f%d' % f: i for f in range(MAX_FIELDS)})
+        for i in range(paginator.per_page)]
+    cursor = serializers.to_cursor(value=value, pk=pk)
+
+    def seek():
+        return paginator.seek(value=value, pk=pk, move_to=NEXT_PAGE)
+
+    def compile_seek():
+        return seek().query.get_compiler('default').as_sql()
+
+    return {
+        'fields_direction': lambda: paginator.fields_direction,
+        'prepare_order': lambda: paginator.prepare_order(
+            has_pk=True, move_to=NEXT_PAGE),
+        'seek_filter': lambda: paginator._seek_filter(
+            value=value, pk=pk, move_to=NEXT_PAGE),
+        'seek_filter_row_values': lambda: row_values_paginator._seek_filter(
+            value=value, pk=pk, move_to=NEXT_PAGE),
+        'seek': seek,
+        'compile': compile_seek,
+        'next_page': page.next_page,
+        'to_cursor': lambda: serializers.to_cursor(value=value, pk=pk),
+        'from_cursor': lambda: serializers.from_cursor(cursor)}
+
+
+def _ns_per_op(func, number, repeat):
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter_ns() - start) / number)
+    finally:
+        gc.enable()
+    return sorted(timings)
+
+
+def _peak_bytes(func):
+    tracemalloc.start()
+    try:
+        func()  # allocate the caches
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - current
+
+
+def _result(op, fields, func, number, repeat):
+    func()  # warm up
+    timings = _ns_per_op(func, number, repeat)
+    return {
+        'op': op,
+        'fields': fields,
+        'min': timings[0],
+        'median': timings[len(timings) // 2],
+        'p95': timings[max(0, -(-len(timings) * 95 // 100) - 1)],
+        'peak_bytes': _peak_bytes(func)}
+
+
+def run(fields=(1, 2, 4, 8), number=1000, repeat=5):
+    """
+    Measure the Python overhead of the paginator
+    operations for each number of lookup ``fields``.
+    Return the ``min``, ``median`` and ``p95`` ns per
+    op, and the ``peak_bytes`` allocated by one op
+    """
+    assert all(0 < f <= MAX_FIELDS for f in fields)
+    results = [
+        _result(
+            'page_key', 0,
+            lambda: serializers.page_key('1552349160.099628-5'),
+            number, repeat)]
+    for f in fields:
+        for op, func in _operations(f).items():
+            results.append(_result(op, f, func, number, repeat))
+    return {
+        'meta': {
+            'number': number,
+            'repeat': repeat},
+        'results': results}
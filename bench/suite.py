@@ -0,0 +1,181 @@
+#-*- coding: utf-8 -*-
+
+import json
+import math
+import platform
+import statistics
+import itertools
+import time
+
+import django
+from django.db import connections
+
+from infinite_scroll_pagination.paginator import (
+    SeekPaginator, NEXT_PAGE, PREV_PAGE)
+
+from . import dataset
+
+__all__ = [
+    'SHAPES',
+    'populate',
+    'run',
+    'compare',
+    'print_results',
+    'dump',
+    'load']
+
+
+# Lookup fields by name; covers the
+# number of fields and direction mixes
+SHAPES = {
+    'unique': ('-date_unique',),
+    'date_pk': ('-date',),
+    'sticky_date': ('-is_sticky', '-date'),
+    'pinned_sticky_date': ('-is_pinned', '-is_sticky', '-date'),
+    'mixed': ('is_pinned', '-is_sticky', '-date')}
+
+_DIRECTIONS = {
+    'next': NEXT_PAGE,
+    'prev': PREV_PAGE}
+
+
+def _timings(func, repeat):
+    func()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _stats(timings):
+    timings = sorted(timings)
+    return {
+        'min': timings[0],
+        'median': statistics.median(timings),
+        'p95': timings[max(0, math.ceil(len(timings) * 0.95) - 1)]}
+
+
+def populate(size, **kwargs):
+    """
+    Replace the ``Article`` rows by ``size`` new
+    rows, see ``dataset.generate()`` for the ``kwargs``
+    """
+    from tests.models import Article
+    Article.objects.all()._raw_delete(Article.objects.db)
+    dataset.generate(size, **kwargs)
+
+
+def _bench_case(size, shape, per_page, depth, repeat):
+    from tests.models import Article
+    paginator = SeekPaginator(
+        Article.objects.all(), per_page=per_page, lookup_field=SHAPES[shape])
+    order = paginator.prepare_order(has_pk=True, move_to=NEXT_PAGE)
+    offset = int(size * depth) // per_page * per_page
+    offset = max(per_page, min(offset, size - 2 * per_page))
+    rows = list(Article.objects.order_by(*order)[
+        offset - 1:offset + per_page + 1])
+    case = {
+        'size': size,
+        'shape': shape,
+        'per_page': per_page,
+        'depth': depth}
+
+    def offset_page():
+        assert list(Article.objects.order_by(*order)[
+            offset:offset + per_page])
+
+    yield dict(case, method='offset', direction=None,
+               **_stats(_timings(offset_page, repeat)))
+
+    for direction, move_to in _DIRECTIONS.items():
+        row = rows[0] if move_to == NEXT_PAGE else rows[-1]
+
+        def seek_page():
+            assert list(paginator.page(
+                value=tuple(getattr(row, f) for f in paginator.fields),
+                pk=row.pk,
+                move_to=move_to))
+
+        yield dict(case, method='seek', direction=direction,
+                   **_stats(_timings(seek_page, repeat)))
+
+
+def run(
+        sizes=(10_000, 100_000), shapes=tuple(SHAPES),
+        per_pages=(10, 50), depths=(0.1, 0.5, 0.9), repeat=5,
+        dataset_options=None):
+    """
+    Sweep the cases and return the results; each
+    row is a case plus its ``min``, ``median``
+    and ``p95`` timings in seconds. The ``dataset_options``
+    are passed to ``populate()``
+    """
+    connection = connections['default']
+    results = []
+    for size in sizes:
+        populate(size, **(dataset_options or {}))
+        for shape, per_page, depth in itertools.product(
+                shapes, per_pages, depths):
+            results.extend(_bench_case(
+                size, shape, per_page, depth, repeat))
+    return {
+        'meta': {
+            'vendor': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'repeat': repeat,
+            'dataset': dataset_options or {}},
+        'results': results}
+
+
+# Measures, the other keys of a result identify its case
+_MEASURES = frozenset((
+    'min', 'median', 'p95', 'peak_bytes', 'baseline_median', 'ratio'))
+
+
+def _case_key(result):
+    return tuple(sorted(
+        (k, v) for k, v in result.items() if k not in _MEASURES))
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Return the results of ``current`` which ``median``
+    is over ``threshold`` times slower than the ``baseline`` one.
+    Each result gets the ``baseline_median`` and ``ratio``
+    """
+    baseline = {_case_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        base = baseline.get(_case_key(result))
+        if base is None:
+            continue
+        ratio = result['median'] / base['median']
+        if ratio > 1 + threshold:
+            regressions.append(dict(
+                result, baseline_median=base['median'], ratio=ratio))
+    return regressions
+
+
+def print_results(results, file=None):
+    if not results:
+        return
+    header = tuple(results[0])
+    print(' '.join('%-18s' % h for h in header), file=file)
+    for result in results:
+        print(' '.join(
+            '%-18.6f' % result[h] if isinstance(result[h], float)
+            else '%-18s' % (result[h],)
+            for h in header), file=file)
+
+
+def dump(data, path):
+    with open(path, 'w') as fh:
+        json.dump(data, fh, indent=2)
+
+
+def load(path):
+    with open(path) as fh:
+        return json.load(fh)
@@ -0,0 +1,103 @@
+#-*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+from django.db import connections, models
+
+from .paginator import NEXT_PAGE
+
+__all__ = [
+    'IndexAdvice',
+    'advise']
+
+
+# ``index_name`` is the matching index, or ``None``;
+# ``index`` and ``operation`` are the suggested
+# ``models.Index`` and migration operation code
+IndexAdvice = namedtuple(
+    'IndexAdvice',
+    ['model', 'fields', 'index_name', 'index', 'operation'])
+
+
+def _order_columns(model, order):
+    fields = []
+    columns = []
+    for name in order:
+        desc = name.startswith('-')
+        name = name.lstrip('-')
+        if name == 'pk':
+            field = model._meta.pk
+        else:
+            field = model._meta.get_field(name)
+        if field.column in (c for c, _ in columns):
+            continue
+        fields.append('%s%s' % ('-' if desc else '', field.name))
+        columns.append((field.column, desc))
+    return fields, columns
+
+
+def _matches(constraint, columns, equal=0):
+    """
+    The constraint matches when the ordering columns are a prefix
+    of its columns, or when its columns are a prefix of the ordering
+    ones and it's unique (the rest of the ordering is then redundant).
+    The orders must be all the same, or all reversed, except
+    for the first ``equal`` columns, which are filtered by equality
+    """
+    index_columns = constraint['columns']
+    orders = constraint.get('orders') or ['ASC'] * len(index_columns)
+    unique = constraint['unique'] or constraint['primary_key']
+    reversed_ = None
+    for i, (column, desc) in enumerate(columns):
+        if i >= len(index_columns):
+            return unique
+        if index_columns[i] != column:
+            return False
+        if i < equal:
+            continue
+        flipped = desc != (orders[i] == 'DESC')
+        if reversed_ is None:
+            reversed_ = flipped
+        if flipped != reversed_:
+            return False
+    return True
+
+
+def advise(paginator, using=None):
+    """
+    Look for an index matching the ``paginator`` ordering
+    (``prepare_order()`` with the pk as last field) in the
+    database. Either the ordering, or its reverse is
+    a match, since indexes can be scanned backwards.
+    The direction of the ``prefix_fields`` does not matter.
+
+    Return an ``IndexAdvice``
+    """
+    model = paginator.query_set.model
+    using = using or paginator.query_set.db
+    connection = connections[using]
+    fields, columns = _order_columns(
+        model, paginator.prepare_order(has_pk=True, move_to=NEXT_PAGE))
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table)
+    index_name = None
+    for name, constraint in sorted(constraints.items()):
+        is_index = (
+            constraint['index'] or
+            constraint['unique'] or
+            constraint['primary_key'])
+        if (is_index and constraint['columns'] and
+                _matches(constraint, columns, len(paginator.prefix_fields))):
+            index_name = name
+            break
+    index = models.Index(fields=fields)
+    index.set_name_with_model(model)
+    index_code = 'models.Index(fields=%r, name=%r)' % (fields, index.name)
+    return IndexAdvice(
+        model=model,
+        fields=fields,
+        index_name=index_name,
+        index=index_code,
+        operation='migrations.AddIndex(model_name=%r, index=%s)' % (
+            model._meta.model_name, index_code))
@@ -0,0 +1,77 @@
+#-*- coding: utf-8 -*-
+
+import time
+
+from django.db import transaction
+
+from .paginator import NEXT_PAGE
+
+__all__ = [
+    'run_batches',
+    'DELETE']
+
+
+DELETE = 'delete'
+
+
+def _apply(action, query_set):
+    if action == DELETE:
+        query_set.delete()
+    elif isinstance(action, dict):
+        query_set.update(**action)
+    else:
+        action(query_set)
+
+
+def run_batches(
+        paginator, action, batch_size=None, value=None, pk=None,
+        sleep=0, throttle=None, checkpoint=None):
+    """
+    Apply ``action`` to consecutive keyset batches of
+    the ``paginator.query_set`` rows. The ``action`` is
+    either ``DELETE``, a dict of fields to ``update()``,
+    or a callable receiving the batch queryset. The batch
+    queryset is a plain ``pk__in`` filter of the model base
+    manager, without the ``distinct()``, ``values()``,
+    annotations or ordering of the ``paginator.query_set``.
+
+    Each batch is ``batch_size`` rows (``per_page`` by default),
+    and it's fetched and written within its own transaction.
+    After each commit, ``checkpoint(key)`` is called with the
+    last key of the batch; pass it as ``**key`` to resume
+    after it. Between batches, it waits ``sleep`` seconds
+    and then calls ``throttle(rows)`` if given, i.e: to wait
+    for the replication lag to go down.
+
+    The ``action`` should not change the ``lookup_field``
+    values, or the rows may be skipped or visited twice.
+
+    Return the number of rows in all of the batches
+    """
+    batch_size = batch_size or paginator.per_page
+    db = paginator.query_set.db
+    manager = paginator.query_set.model._base_manager
+    fields = paginator.fields + ('pk',)
+    key = {'value': value, 'pk': pk}
+    total = 0
+    while True:
+        with transaction.atomic(using=db):
+            rows = list(
+                paginator.seek(move_to=NEXT_PAGE, **key)
+                .values_list(*fields)[:batch_size])
+            if not rows:
+                break
+            _apply(action, manager.using(db).filter(
+                pk__in=[row[-1] for row in rows]))
+        (*value, pk) = rows[-1]
+        key = {'value': tuple(value), 'pk': pk}
+        total += len(rows)
+        if checkpoint is not None:
+            checkpoint(key)
+        if len(rows) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+        if throttle is not None:
+            throttle(len(rows))
+    return total
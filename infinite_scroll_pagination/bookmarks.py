@@ -0,0 +1,146 @@
+#-*- coding: utf-8 -*-
+
+import itertools
+
+from django.core.cache import caches
+from django.core.paginator import EmptyPage
+
+from .paginator import SeekPage, NEXT_PAGE, DESC, _fingerprint
+
+__all__ = ['BookmarkIndex']
+
+
+class BookmarkIndex:
+    """
+    Sparse index of every ``interval``-th key of the
+    ``paginator`` ordering, stored in the ``alias``
+    Django cache. It serves ``page(number)`` as a seek
+    from the nearest bookmark plus an offset of less
+    than ``interval`` rows, instead of ``OFFSET (number - 1) * per_page``.
+
+    The index is built on first use, in a single pass
+    over the keys. Call ``refresh(value, pk)`` after a row
+    is created or deleted, or with the first of the old
+    and new keys when it's changed; only the bookmarks
+    from that key onwards are rebuilt
+    """
+    def __init__(
+            self, paginator, interval=None, alias='default',
+            timeout=None, key_prefix='isp', chunk_size=2000):
+        self.paginator = paginator
+        self.interval = interval or paginator.per_page * 10
+        assert self.interval > 0
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.chunk_size = chunk_size
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self):
+        return '%s:bookmarks:%s:%s' % (
+            self.key_prefix,
+            self.paginator.query_set.model._meta.label_lower,
+            _fingerprint(self.paginator, self.interval))
+
+    def _precedes(self, a, b):
+        fields = tuple(self.paginator.fields_direction)
+        directions = [d for _, d in fields] + [fields[-1][1]]
+        for x, y, d in zip(
+                a['value'] + (a['pk'],), b['value'] + (b['pk'],), directions):
+            if x == y:
+                continue
+            if d == DESC:
+                return x > y
+            return x < y
+        return False
+
+    def _scan(self, start, index):
+        rows = (
+            self.paginator
+            .seek(move_to=NEXT_PAGE, **start)
+            .values_list(*self.paginator.fields, 'pk')
+            .iterator(chunk_size=self.chunk_size))
+        count = 0
+        for count, row in enumerate(rows, 1):
+            if count % self.interval == 0:
+                (*value, pk) = row
+                index['bookmarks'].append({'value': tuple(value), 'pk': pk})
+        index['count'] += count
+        self.cache.set(self._key(), index, timeout=self.timeout)
+        return index
+
+    def build(self):
+        """Rebuild the whole index"""
+        return self._scan(
+            start={'value': None, 'pk': None},
+            index={'bookmarks': [], 'count': 0})
+
+    def _index(self):
+        index = self.cache.get(self._key())
+        if index is None:
+            index = self.build()
+        return index
+
+    def refresh(self, value, pk):
+        """
+        Rebuild the bookmarks after the last one
+        preceding the changed ``value`` and ``pk``
+        """
+        index = self.cache.get(self._key())
+        if index is None:
+            return self.build()
+        if not isinstance(value, (tuple, list)):
+            value = (value,)
+        changed = {'value': tuple(value), 'pk': pk}
+        bookmarks = list(itertools.takewhile(
+            lambda bookmark: self._precedes(bookmark, changed),
+            index['bookmarks']))
+        if not bookmarks:
+            return self.build()
+        return self._scan(
+            start=bookmarks[-1],
+            index={
+                'bookmarks': bookmarks,
+                'count': len(bookmarks) * self.interval})
+
+    def count(self):
+        """Return the number of rows when the index was built"""
+        return self._index()['count']
+
+    def num_pages(self):
+        """Return the number of pages when the index was built"""
+        return max(1, (-self.count() // self.paginator.per_page) * -1)  # ceil
+
+    def page(self, number):
+        """
+        Return the page ``number``, starting at 1.
+        The page keys are ordered by pk as last field.
+
+        :raises: ``EmptyPage``
+        """
+        assert number >= 1
+        per_page = self.paginator.per_page
+        bookmarks = self._index()['bookmarks']
+        start = (number - 1) * per_page
+        i = min(start // self.interval, len(bookmarks))
+        key = {'value': None, 'pk': None}
+        if i:
+            key = bookmarks[i - 1]
+        offset = start - i * self.interval
+        object_list = list(
+            self.paginator.seek(move_to=NEXT_PAGE, **key)
+            [offset:offset + per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage()
+        page = SeekPage(
+            query_set=None,
+            key=key,
+            move_to=NEXT_PAGE,
+            paginator=self.paginator)
+        page._has_next = len(object_list) > per_page
+        page._has_previous = number > 1
+        page._object_list = object_list[:per_page]
+        return page
@@ -0,0 +1,279 @@
+#-*- coding: utf-8 -*-
+
+import copy
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.cache import caches
+from django.core.paginator import EmptyPage
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+
+from .paginator import SeekPage, NEXT_PAGE, _NO_PK, _fingerprint
+
+__all__ = [
+    'PageCache',
+    'ReadAhead',
+    'ReadAheadInfo']
+
+
+ReadAheadInfo = namedtuple(
+    'ReadAheadInfo',
+    ['submitted', 'dropped', 'completed', 'failed', 'pending'])
+
+
+class PageCache:
+    """
+    Cache of ``SeekPaginator`` pages, pass it as
+    ``SeekPaginator(..., page_cache=PageCache())``.
+
+    A page is stored in the ``alias`` Django cache as its
+    pks and ``has_next``/``has_previous``, for ``timeout``
+    seconds. The entries are evicted by the cache backend
+    (i.e: LRU for locmem, Redis and Memcached). A cached page
+    is rehydrated with a single ``pk__in`` query.
+
+    The key is made of the queryset SQL, the lookup fields,
+    ``per_page``, direction, page key, and a generation number
+    of the model. Saving or deleting an instance of the model
+    bumps the generation, which invalidates all of its pages.
+    ``QuerySet.update()`` does not send signals, call
+    ``invalidate()`` after it. Call ``watch()`` to invalidate
+    the pages on changes of other models, i.e: the
+    ``select_related`` ones.
+
+    The ``post_save`` and ``post_delete`` receivers are
+    connected when a paginator is created with the page
+    cache, or for the ``models`` passed here. A process
+    that writes rows but never creates the paginator
+    (i.e: a worker) must create the page cache with
+    those ``models``, or call ``watch()``
+    """
+    def __init__(
+            self, alias='default', timeout=60,
+            key_prefix='isp', models=()):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+        self.read_ahead_hits = 0
+        self._watched = set()
+        self._receivers = []
+        self._lock = threading.Lock()
+        for model in models:
+            self.watch(model)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self, model):
+        return '%s:gen:%s' % (self.key_prefix, model._meta.label_lower)
+
+    def _generation(self, model):
+        # Seed by time, so an evicted generation
+        # does not revalidate the older pages
+        return self.cache.get_or_set(
+            self._generation_key(model), time.time_ns(), timeout=None)
+
+    def _key(self, paginator, value, pk, move_to):
+        if pk is _NO_PK:
+            pk = '_NO_PK'
+        model = paginator.query_set.model
+        return '%s:page:%s:%s:%s' % (
+            self.key_prefix,
+            model._meta.label_lower,
+            self._generation(model),
+            _fingerprint(paginator, paginator.per_page, move_to, value, pk))
+
+    def invalidate(self, model):
+        """Invalidate all of the pages of the ``model``"""
+        key = self._generation_key(model)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, time.time_ns(), timeout=None)
+
+    def watch(self, model, invalidate_model=None):
+        """
+        Invalidate the pages of ``invalidate_model``
+        (``model`` by default) on ``post_save``
+        and ``post_delete`` of ``model``
+        """
+        invalidate_model = invalidate_model or model
+        with self._lock:
+            if (model, invalidate_model) in self._watched:
+                return
+            self._watched.add((model, invalidate_model))
+
+            def receiver(sender, **kwargs):
+                self.invalidate(invalidate_model)
+
+            # The signals keep a weak reference,
+            # the receiver lives as long as the page cache
+            self._receivers.append(receiver)
+        for signal in (post_save, post_delete):
+            signal.connect(receiver, sender=model)
+
+    def _count(self, hit, read_ahead=False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.read_ahead_hits += int(read_ahead)
+            else:
+                self.misses += 1
+
+    def get(self, paginator, value, pk, move_to, key=None):
+        """
+        Return the cached ``SeekPage``, or ``None``.
+        Pass the ``key`` when it's already known
+        """
+        key = key or self._key(paginator, value, pk, move_to)
+        entry = self.cache.get(key)
+        if entry is None:
+            self._count(hit=False)
+            return None
+        row_pk = paginator._row_pk
+        rows = {
+            row_pk(obj): obj
+            for obj in paginator.query_set.filter(pk__in=entry['pks'])}
+        if len(rows) != len(entry['pks']):
+            self._count(hit=False)
+            return None
+        self._count(hit=True, read_ahead=entry.get('read_ahead', False))
+        page = SeekPage(
+            query_set=None,
+            key={'value': value, 'pk': pk},
+            move_to=move_to,
+            paginator=paginator)
+        page._object_list = [rows[row_pk] for row_pk in entry['pks']]
+        page._has_next = entry['has_next']
+        page._has_previous = entry['has_previous']
+        return page
+
+    def has(self, paginator, value, pk, move_to):
+        return self.cache.has_key(
+            self._key(paginator, value, pk, move_to))
+
+    def set(self, page, read_ahead=False, key=None):
+        """
+        Store the page. This fetches the page
+        rows, ``has_next`` and ``has_previous``.
+        Pass the ``key`` computed before the page
+        rows were fetched, if they were
+        """
+        paginator = page.paginator
+        self.watch(paginator.query_set.model)
+        # The generation is read before fetching the rows,
+        # so a change in between invalidates this entry
+        key = key or self._key(
+            paginator,
+            page._key['value'],
+            page._key['pk'],
+            page._move_to)
+        if not page.object_list:
+            return
+        self.cache.set(
+            key,
+            {
+                'pks': [paginator._row_pk(obj) for obj in page.object_list],
+                'has_next': page.has_next(),
+                'has_previous': page.has_previous(),
+                'read_ahead': read_ahead},
+            timeout=self.timeout)
+
+
+class ReadAhead:
+    """
+    Prefetch the next page into the page cache, pass it as
+    ``SeekPaginator(..., page_cache=..., read_ahead=ReadAhead())``.
+
+    Once ``page()`` is served, its next page is fetched in a
+    pool of ``max_workers`` threads, each with its own DB
+    connection. Up to ``max_pending`` pages are queued,
+    the rest are dropped; a page already queued or cached
+    is not fetched again. See ``info()`` and the
+    ``PageCache.read_ahead_hits`` counter
+    """
+    def __init__(self, max_workers=2, max_pending=16):
+        assert max_workers > 0
+        assert max_pending > 0
+        self.max_pending = max_pending
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='read_ahead')
+
+    def submit(self, page):
+        """
+        Queue the fetch of the page after ``page``.
+        Return ``True`` if it was queued
+        """
+        if not page.has_next():
+            return False
+        paginator = page.paginator
+        key = {'pk': _NO_PK, **page.next_page()}
+        cache_key = paginator.page_cache._key(
+            paginator, move_to=NEXT_PAGE, **key)
+        with self._lock:
+            if cache_key in self._pending:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self.submitted += 1
+            self._pending[cache_key] = self._executor.submit(
+                self._fetch, paginator, key, cache_key)
+        return True
+
+    def _fetch(self, paginator, key, cache_key):
+        db = paginator.query_set.db
+        try:
+            page_cache = paginator.page_cache
+            if not page_cache.has(paginator, move_to=NEXT_PAGE, **key):
+                paginator = copy.copy(paginator)
+                paginator.page_cache = None
+                paginator.read_ahead = None
+                try:
+                    page = paginator.page(move_to=NEXT_PAGE, **key)
+                except EmptyPage:
+                    pass
+                else:
+                    page_cache.set(page, read_ahead=True, key=cache_key)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+        finally:
+            connections[db].close()
+            with self._lock:
+                del self._pending[cache_key]
+
+    def info(self):
+        with self._lock:
+            return ReadAheadInfo(
+                submitted=self.submitted,
+                dropped=self.dropped,
+                completed=self.completed,
+                failed=self.failed,
+                pending=len(self._pending))
+
+    def wait(self):
+        """Wait for the queued pages to be fetched"""
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
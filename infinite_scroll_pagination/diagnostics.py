@@ -0,0 +1,129 @@
+#-*- coding: utf-8 -*-
+
+import re
+import threading
+import warnings
+from collections import namedtuple
+
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, NotSupportedError, connections
+
+__all__ = [
+    'SeekPlanWarning',
+    'PlanInfo',
+    'PlanInspector',
+    'explain',
+    'classify']
+
+
+class SeekPlanWarning(RuntimeWarning):
+    """The seek query scans the whole table, or sorts it"""
+
+
+# ``full_scan`` and ``sort`` are ``None``
+# when the plan could not be classified
+PlanInfo = namedtuple(
+    'PlanInfo', ['shape', 'sql', 'plan', 'full_scan', 'sort'])
+
+_FULL_SCAN = (
+    # SQLite, a scan without an index
+    re.compile(r'\bSCAN (TABLE )?\S+\s*$', re.MULTILINE),
+    # PostgreSQL
+    re.compile(r'\bSeq Scan\b'),
+    # MySQL
+    re.compile(r'\btype: ALL\b|\bFull scan\b|\bTable scan\b'))
+_SORT = (
+    # SQLite
+    re.compile(r'\bUSE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY\b'),
+    # PostgreSQL
+    re.compile(r'(^|->)\s*(Incremental )?Sort\b', re.MULTILINE),
+    # MySQL
+    re.compile(r'\bUsing filesort\b|\bSort:'))
+_KNOWN_VENDORS = frozenset(('sqlite', 'postgresql', 'mysql'))
+
+
+def explain(query_set):
+    """
+    Return the ``EXPLAIN`` of the ``query_set``, or
+    ``EXPLAIN QUERY PLAN`` on SQLite; or ``None``
+    when the database does not support it
+    """
+    try:
+        return query_set.explain()
+    except (NotSupportedError, DatabaseError, EmptyResultSet):
+        return None
+
+
+def classify(plan):
+    """
+    Return whether the ``plan`` text has a
+    ``(full_scan, sort)``, as a tuple of bools
+    """
+    return (
+        any(regex.search(plan) for regex in _FULL_SCAN),
+        any(regex.search(plan) for regex in _SORT))
+
+
+class PlanInspector:
+    """
+    Capture the plan of each seek query shape, pass it
+    as ``SeekPaginator(..., plan_inspector=PlanInspector())``.
+    This is meant for development and tests, it runs an extra
+    ``EXPLAIN`` query the first time a shape is seen.
+
+    A ``SeekPlanWarning`` is issued once per shape when
+    its plan scans the whole table or sorts it, which means
+    there is no index matching the ``lookup_field`` ordering.
+
+    The ``plans`` are keyed by the database alias, the
+    fingerprint of the paginator queryset and lookup fields,
+    the ``filter_strategy`` and the shape. So an inspector can
+    be shared by many paginators. See ``plans_by_shape()``
+    """
+    def __init__(self, warn=True):
+        self.warn = warn
+        self.plans = {}
+        self._lock = threading.Lock()
+
+    def inspect(self, shape, query_set, key=None):
+        """
+        Capture the plan of ``query_set`` for the ``shape``.
+        The ``key`` is the ``shape`` by default
+        """
+        key = key or shape
+        with self._lock:
+            if key in self.plans:
+                return self.plans[key]
+            self.plans[key] = None
+        plan = explain(query_set)
+        full_scan = sort = sql = None
+        if plan is not None:
+            sql = str(query_set.query)
+            if connections[query_set.db].vendor in _KNOWN_VENDORS:
+                full_scan, sort = classify(plan)
+        info = PlanInfo(
+            shape=shape,
+            sql=sql,
+            plan=plan,
+            full_scan=full_scan,
+            sort=sort)
+        with self._lock:
+            self.plans[key] = info
+        if self.warn and (full_scan or sort):
+            warnings.warn(
+                'The seek query shape %s %s; add an index matching '
+                'its order. Plan:\n%s' % (
+                    shape,
+                    'scans the whole table' if full_scan
+                    else 'sorts the rows',
+                    plan),
+                SeekPlanWarning,
+                stacklevel=2)
+        return info
+
+    def plans_by_shape(self, shape):
+        """Return the captured plans of the ``shape``"""
+        with self._lock:
+            return [
+                info for info in self.plans.values()
+                if info is not None and info.shape == shape]
@@ -0,0 +1,158 @@
+#-*- coding: utf-8 -*-
+
+import bisect
+import contextlib
+import threading
+import time
+from collections import namedtuple
+
+from django.db import connections
+
+__all__ = [
+    'OperationStats',
+    'Histogram',
+    'StatsCollector']
+
+
+# The ``shape`` is the ``ORDER BY`` of the operation's
+# seek, prefixed by ``seek:``, or ``first:`` for the first
+# page. The ``depth`` is the number of key columns the
+# seek filters by, or ``0`` for the first page
+OperationStats = namedtuple(
+    'OperationStats',
+    ['operation', 'shape', 'depth', 'queries', 'time', 'db_time', 'rows'])
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def measure(callback, operation, using, shape, depth):
+    """
+    Count the queries and time of the block, and
+    report them to ``callback(OperationStats)``. The
+    block can set ``counters['rows']``. Nested blocks
+    are not reported, they count for the outer one
+    """
+    if callback is None or getattr(_local, 'active', False):
+        yield {}
+        return
+    counters = {'queries': 0, 'db_time': 0.0, 'rows': 0}
+
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            counters['queries'] += 1
+            counters['db_time'] += time.perf_counter() - start
+
+    _local.active = True
+    start = time.perf_counter()
+    try:
+        with connections[using].execute_wrapper(wrapper):
+            yield counters
+    finally:
+        _local.active = False
+        callback(OperationStats(
+            operation=operation,
+            shape=shape,
+            depth=depth,
+            queries=counters['queries'],
+            time=time.perf_counter() - start,
+            db_time=counters['db_time'],
+            rows=counters['rows']))
+
+
+class Histogram:
+    """Cumulative histogram of the observed values"""
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return ``(le, count)`` pairs, the last ``le`` is ``'+Inf'``"""
+        result = []
+        total = 0
+        for le, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            result.append((le, total))
+        return result
+
+
+class StatsCollector:
+    """
+    In-process aggregator of ``OperationStats``,
+    pass it as ``SeekPaginator(..., instrument=StatsCollector())``.
+    It keeps a histogram of each measure (``time``,
+    ``db_time``, ``queries`` and ``rows``) per
+    operation and shape. See ``snapshot()``
+    and ``prometheus()``
+    """
+    TIME_BUCKETS = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+    COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+    _MEASURES = (
+        ('time', TIME_BUCKETS),
+        ('db_time', TIME_BUCKETS),
+        ('queries', COUNT_BUCKETS),
+        ('rows', COUNT_BUCKETS))
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stats):
+        key = (stats.operation, stats.shape)
+        with self._lock:
+            histograms = self._histograms.get(key)
+            if histograms is None:
+                histograms = self._histograms[key] = {
+                    measure: Histogram(buckets)
+                    for measure, buckets in self._MEASURES}
+            for measure, _ in self._MEASURES:
+                histograms[measure].observe(getattr(stats, measure))
+
+    def snapshot(self):
+        """
+        Return a dict of ``(operation, shape)`` to a dict of
+        measure to ``{'buckets': [(le, count)], 'sum', 'count'}``
+        """
+        with self._lock:
+            return {
+                key: {
+                    measure: {
+                        'buckets': histogram.cumulative(),
+                        'sum': histogram.sum,
+                        'count': histogram.count}
+                    for measure, histogram in histograms.items()}
+                for key, histograms in self._histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def prometheus(self, prefix='seek_paginator'):
+        """Return the histograms in the Prometheus text format"""
+        lines = []
+        snapshot = self.snapshot()
+        for measure, _ in self._MEASURES:
+            name = '%s_%s' % (prefix, measure)
+            lines.append('# TYPE %s histogram' % name)
+            for (operation, shape), histograms in sorted(snapshot.items()):
+                labels = 'operation="%s",shape="%s"' % (operation, shape)
+                histogram = histograms[measure]
+                for le, count in histogram['buckets']:
+                    lines.append('%s_bucket{%s,le="%s"} %s' % (
+                        name, labels, le, count))
+                lines.append('%s_sum{%s} %s' % (
+                    name, labels, histogram['sum']))
+                lines.append('%s_count{%s} %s' % (
+                    name, labels, histogram['count']))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,73 @@
+#-*- coding: utf-8 -*-
+
+from django.apps import apps
+from django.core.exceptions import (
+    FieldDoesNotExist, FieldError, ValidationError)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from ...advisor import advise
+from ...paginator import SeekPaginator
+
+
+class Command(BaseCommand):
+    help = (
+        'Check there is an index matching the ordering '
+        'of a SeekPaginator, and suggest one otherwise')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'model', help='app_label.ModelName')
+        parser.add_argument(
+            '--lookup-field', required=True,
+            help=(
+                'the paginator lookup fields, comma separated, '
+                'i.e: --lookup-field=-is_pinned,-date'))
+        parser.add_argument(
+            '--prefix-field', action='append', default=[],
+            help=(
+                'a paginator prefix field and its value, '
+                'it can be repeated, i.e: --prefix-field=tenant_id=1'))
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--check', action='store_true',
+            help='exit with an error when the index is missing')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as err:
+            raise CommandError(str(err))
+        prefix_fields = {}
+        for prefix_field in options['prefix_field']:
+            name, sep, value = prefix_field.partition('=')
+            if not sep:
+                raise CommandError(
+                    'Expected --prefix-field=name=value, got %r' % (
+                        prefix_field,))
+            prefix_fields[name] = value
+        try:
+            paginator = SeekPaginator(
+                model._default_manager.using(options['database']),
+                per_page=1,
+                lookup_field=tuple(options['lookup_field'].split(',')),
+                prefix_fields=prefix_fields)
+            advice = advise(paginator)
+        except (
+                FieldDoesNotExist, FieldError,
+                ValidationError, ValueError) as err:
+            raise CommandError(str(err))
+        self.stdout.write('%s ordered by %s' % (
+            model._meta.label, ', '.join(advice.fields)))
+        if advice.index_name is not None:
+            self.stdout.write(self.style.SUCCESS(
+                'Matching index: %s' % advice.index_name))
+            return
+        self.stdout.write(self.style.WARNING('No matching index'))
+        self.stdout.write('Add it to the model Meta.indexes:')
+        self.stdout.write('    %s' % advice.index)
+        self.stdout.write('Or run the migration operation:')
+        self.stdout.write('    %s' % advice.operation)
+        if options['check']:
+            raise CommandError('Missing index', returncode=1)
@@ -1,22 +1,82 @@
 #-*- coding: utf-8 -*-
 
+import contextlib
+import copy
+import functools
+import hashlib
+import itertools
+import json
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, namedtuple
 try:
     from collections.abc import Sequence
 except ImportError:
     from collections import Sequence
 
+from asgiref.sync import sync_to_async
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
 from django.core.paginator import EmptyPage
-from django.db.models import QuerySet, Q
+from django.db import connections
+from django.db.models import (
+    QuerySet, Q, F, Expression, Field, Func, Value, Window)
+from django.db.models.functions import RowNumber
+from django.db.models.lookups import GreaterThan, LessThan
+from django.db.models.query import (
+    ModelIterable, ValuesIterable, NamedValuesListIterable,
+    FlatValuesListIterable, RawQuerySet)
+from django.db.models.utils import create_namedtuple_class
+
+from .instrumentation import measure
 
 __all__ = [
     'SeekPaginator',
     'SeekPage',
     'EmptyPage',
     'NEXT_PAGE',
-    'PREV_PAGE']
+    'PREV_PAGE',
+    'Q_FILTER',
+    'ROW_VALUES_FILTER',
+    'SKIP_SCAN_FILTER',
+    'SQLCacheInfo',
+    'KeyRange',
+    'Estimate']
 
 
 NEXT_PAGE, PREV_PAGE, DESC, ASC = range(1, 5)
+Q_FILTER, ROW_VALUES_FILTER, SKIP_SCAN_FILTER = range(1, 4)
+
+# SQLite supports row values since 3.15,
+# but Django requires a newer version anyway
+_ROW_VALUES_VENDORS = frozenset(('postgresql', 'sqlite', 'mysql'))
+
+_ROWS, _EXISTS = range(1, 3)
+
+# Max number of per-value branches of a skip scan
+_SKIP_SCAN_MAX_BRANCHES = 32
+
+SQLCacheInfo = namedtuple(
+    'SQLCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# Rows after the ``start`` key, up to
+# and including the ``stop`` key
+KeyRange = namedtuple('KeyRange', ['start', 'stop'])
+
+
+class Estimate(namedtuple('Estimate', ['value', 'exact', 'threshold'])):
+    """
+    A count that is ``exact`` up to ``threshold``.
+    Past that, the ``value`` is the planner estimate,
+    or ``threshold + 1`` when there is none. It renders
+    as ``'<value>'`` or ``'<threshold>+'``
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        if self.exact:
+            return str(self.value)
+        return '%d+' % self.threshold
 
 
 class _NoPk:
@@ -31,6 +91,146 @@ class _NoPk:
 # the first page
 _NO_PK = _NoPk()
 
+
+class _Row(Func):
+    """Row value constructor, renders ``(a, b, c)``"""
+    template = '(%(expressions)s)'
+
+    def __init__(self, *expressions):
+        super().__init__(*expressions, output_field=Field())
+
+
+class _Param(Expression):
+    """
+    Placeholder for the seek value at ``index``.
+    It compiles to itself, so the param position
+    can be found within the compiled query params
+    """
+    def __init__(self, index):
+        super().__init__(output_field=Field())
+        self.index = index
+
+    def as_sql(self, compiler, connection):
+        return '%s', [self]
+
+
+_SQLCacheEntry = namedtuple(
+    '_SQLCacheEntry', ['sql', 'params', 'slots', 'fields'])
+
+
+class _SQLCache:
+    """Bounded LRU of compiled seek queries"""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return SQLCacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                maxsize=self.maxsize,
+                currsize=len(self._entries))
+
+
+# Shared by the ``shared_sql_cache`` paginators;
+# keyed by the paginator fingerprint and the seek shape
+_shared_sql_cache = _SQLCache(maxsize=256)
+
+
+def _planner_rows(query_set):
+    """
+    Return the planner estimate of the
+    number of rows, or ``None`` if the
+    database does not tell (only PostgreSQL does)
+    """
+    connection = connections[query_set.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = query_set.order_by().query.get_compiler(
+        connection=connection).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) %s' % sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _fingerprint(paginator, *extra):
+    query_set = paginator.query_set
+    try:
+        sql, params = query_set.query.get_compiler(
+            using=query_set.db).as_sql()
+    except EmptyResultSet:
+        sql, params = None, ()
+    fingerprint = repr((
+        query_set.db, sql, params, paginator.lookup_fields) + extra)
+    return hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+
+
+def _row_names(query_set):
+    """Return the field names of a ``values()`` row"""
+    if query_set._fields:
+        return list(query_set._fields)
+    query = query_set.query
+    return [
+        *query.extra_select,
+        *query.values_select,
+        *query.annotation_select]
+
+
+def _pk_name(model, names):
+    """Return the name of the pk in a ``values()`` row"""
+    pk = model._meta.pk
+    for name in ('pk', pk.attname, pk.name):
+        if name in names:
+            return name
+    return None
+
+
+def _measured(operation):
+    """Measure the ``SeekPage`` method as ``operation``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.paginator._measure(
+                    operation, move_to=self._move_to,
+                    **self._key) as counters:
+                result = func(self, *args, **kwargs)
+                if isinstance(result, list):
+                    counters['rows'] = len(result)
+            return result
+        return wrapper
+    return decorator
+
+
 # XXX simplify things by removing the pk parameter,
 #     and requiring it as last field/value; we should
 #     also validate there is a single unique=True field,
@@ -38,15 +238,121 @@ _NO_PK = _NoPk()
 
 
 class SeekPaginator:
-    def __init__(self, query_set, per_page, lookup_field):
+    """
+    Pass ``lookahead=True`` to fetch one extra row
+    along with the page; this answers ``has_next``
+    (or ``has_previous`` when moving to the prev page)
+    without running another query.
+
+    Pass ``filter_strategy=ROW_VALUES_FILTER`` to filter
+    by a row values comparison ``(a, b, id) < (?, ?, ?)``
+    instead of the nested ``Q`` filter. This is only done
+    when all of the fields have the same order, and the
+    database supports it. Otherwise, it fallbacks to ``Q_FILTER``.
+
+    Pass ``filter_strategy=SKIP_SCAN_FILTER`` to fetch the pages
+    as a ``UNION ALL`` of one range scan per value of the leading
+    fields with a small domain, i.e: ``('-is_pinned', '-date')``
+    becomes a ``date, id`` range scan for ``is_pinned = true``,
+    and another one for ``is_pinned = false``. Those are the
+    leading non-null boolean fields, and fields with non-string
+    ``choices`` (i.e: integers); their values must be within the
+    choices. String choices are not supported, since their order
+    depends on the database collation. When the database
+    does not support ``LIMIT`` within ``UNION``, the branches are
+    fetched one by one until the page is full. The other
+    queries use ``ROW_VALUES_FILTER``.
+
+    Pass ``lazy=False`` to fetch the page rows within
+    ``page()``, instead of running a separate query
+    to check the page is not empty.
+
+    Pass ``sql_cache_size`` to keep up to that many
+    compiled queries, one per seek shape (direction,
+    first page or not, etc). Later pages only bind the
+    new values to the cached SQL. This cache lives in
+    the paginator, so it only helps paginators that
+    outlive a request. Pass ``shared_sql_cache=True``
+    instead to share a module level cache between
+    paginators built per request; they still compile
+    the base query once to fingerprint it. Queries with
+    ``select_related``, annotations or ``extra()``,
+    and ``values()`` querysets are not cached
+
+    Pass a ``page_cache`` (i.e: ``PageCache``) to
+    serve repeated ``page()`` calls from a cache, and a
+    ``read_ahead`` (i.e: ``ReadAhead``) to prefetch
+    the next page into it
+
+    Pass an ``instrument`` callable (i.e: ``StatsCollector``)
+    to receive the ``OperationStats`` of ``page()`` and the
+    ``SeekPage`` methods that may query the database
+
+    Pass a ``plan_inspector`` (i.e: ``PlanInspector``)
+    to capture the plan of each page query shape
+
+    Pass ``prefix_fields``, a dict of field to value,
+    i.e: ``{'tenant_id': 1}``, to filter by those fields
+    and order by them first. They are not part of the
+    page keys, so an index on ``(tenant_id, date, id)``
+    serves ``lookup_field='-date'`` with a single range scan
+
+    Pass ``deferred_join=True`` to fetch the page in two
+    queries: the seek selects only the pk and lookup fields,
+    which an index-only scan can serve, then the rows are
+    loaded by ``pk__in``, keeping the ``only()``, ``defer()``,
+    ``select_related`` and ``prefetch_related`` of the
+    queryset. This is meant for wide rows. The compiled
+    queries cache is not used to fetch the rows, and
+    ``SKIP_SCAN_FILTER`` pages are fetched in a single query
+
+    The ``query_set`` can be a ``values()`` or a ``values_list()``
+    (or ``values_list(named=True)``) queryset, to skip the model
+    instantiation. The lookup fields and the pk are added to
+    its fields when missing. ``values_list(flat=True)``
+    is not supported
+    """
+    def __init__(
+            self, query_set, per_page, lookup_field,
+            lookahead=False, lazy=True, filter_strategy=Q_FILTER,
+            sql_cache_size=0, page_cache=None, read_ahead=None,
+            instrument=None, plan_inspector=None, prefix_fields=None,
+            deferred_join=False, shared_sql_cache=False):
         assert isinstance(query_set, QuerySet), 'QuerySet expected'
         assert isinstance(per_page, int), 'Int expected'
+        assert filter_strategy in (
+            Q_FILTER, ROW_VALUES_FILTER, SKIP_SCAN_FILTER)
+        assert isinstance(sql_cache_size, int), 'Int expected'
+        assert not (shared_sql_cache and sql_cache_size), (
+            'Pass either sql_cache_size or shared_sql_cache')
+        assert read_ahead is None or page_cache is not None, (
+            'read_ahead requires a page_cache')
         #assert isinstance(lookup_field, str), 'String expected'
-        self.query_set = query_set
         self.per_page = per_page
         if isinstance(lookup_field, str):
             lookup_field = (lookup_field,)
         self.lookup_fields = lookup_field
+        self.prefix_fields = dict(prefix_fields or {})
+        assert not set(self.prefix_fields) & set(self.fields), (
+            'prefix_fields cannot be lookup fields')
+        self.query_set = self._project_keys(
+            query_set.filter(**self.prefix_fields))
+        self.lookahead = lookahead
+        self.lazy = lazy
+        self.filter_strategy = filter_strategy
+        self._sql_cache = None
+        if sql_cache_size > 0:
+            self._sql_cache = _SQLCache(sql_cache_size)
+        if shared_sql_cache:
+            self._sql_cache = _shared_sql_cache
+        self._sql_cache_prefix = None
+        self.page_cache = page_cache
+        if page_cache is not None:
+            page_cache.watch(self.query_set.model)
+        self.read_ahead = read_ahead
+        self.instrument = instrument
+        self.plan_inspector = plan_inspector
+        self.deferred_join = deferred_join
 
     @property
     def fields(self):
@@ -59,12 +365,75 @@ class SeekPaginator:
             (f.lstrip('-'), d[f.startswith('-')])
             for f in self.lookup_fields)
 
+    def _project_keys(self, query_set):
+        """Add the lookup fields and pk to a ``values()`` queryset"""
+        iterable = query_set._iterable_class
+        if iterable is ModelIterable:
+            return query_set
+        assert iterable is not FlatValuesListIterable, (
+            'values_list(flat=True) is not supported')
+        names = _row_names(query_set)
+        missing = [f for f in self.fields if f not in names]
+        if _pk_name(query_set.model, names) is None:
+            missing.append('pk')
+        if not missing:
+            return query_set
+        if iterable is ValuesIterable:
+            return query_set.values(*names, *missing)
+        return query_set.values_list(
+            *names, *missing, named=iterable is NamedValuesListIterable)
+
+    def _row_getter(self):
+        """
+        Return a ``get(row, name)`` for the rows of the
+        queryset; model instances, dicts, or tuples
+        """
+        iterable = self.query_set._iterable_class
+        if iterable in (ModelIterable, NamedValuesListIterable):
+            return getattr
+        if iterable is ValuesIterable:
+            return operator.getitem
+        indexes = {
+            name: i
+            for i, name in enumerate(_row_names(self.query_set))}
+        return lambda row, name: row[indexes[name]]
+
+    def _row_pk_name(self):
+        if self.query_set._iterable_class is ModelIterable:
+            return 'pk'
+        return _pk_name(
+            self.query_set.model, _row_names(self.query_set))
+
+    def _row_pk(self, row):
+        return self._row_getter()(row, self._row_pk_name())
+
+    def _row_key(self, row):
+        """Return the ``(value, pk)`` of the ``row``"""
+        get = self._row_getter()
+        return (
+            tuple(get(row, f) for f in self.fields),
+            get(row, self._row_pk_name()))
+
+    def _prefix_order(self):
+        # Order by the column, not the
+        # related model ordering
+        model = self.query_set.model
+        result = []
+        for name in self.prefix_fields:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                result.append(name)
+                continue
+            result.append(field.attname)
+        return result
+
     def prepare_order(self, has_pk, move_to):
         fields = list(self.fields_direction)
         if has_pk:
             fields.append(
                 ('pk', fields[-1][1]))
-        result = []
+        result = self._prefix_order()
         for f, d in fields:
             if ((d == DESC and move_to == NEXT_PAGE) or
                     (d == ASC and move_to == PREV_PAGE)):
@@ -72,6 +441,35 @@ class SeekPaginator:
             result.append(f)
         return result
 
+    def _shape(self, value, pk, move_to):
+        """
+        Return ``(shape, depth)``; the ``shape`` is the seek's
+        ``ORDER BY`` prefixed by ``seek:``, or ``first:`` for the
+        first page. The ``depth`` is the number of key columns
+        """
+        if not isinstance(value, (tuple, list)):
+            value = (value,)
+        has_value = all(v is not None for v in value)
+        depth = 0
+        if has_value:
+            depth = len(self.lookup_fields) + int(pk is not _NO_PK)
+        shape = '%s:%s' % (
+            'seek' if has_value else 'first',
+            ','.join(self.prepare_order(
+                has_pk=pk is not _NO_PK, move_to=move_to)))
+        return shape, depth
+
+    def _measure(self, operation, value, pk, move_to):
+        if self.instrument is None:
+            return contextlib.nullcontext({})
+        shape, depth = self._shape(value, pk, move_to)
+        return measure(
+            self.instrument,
+            operation,
+            using=self.query_set.db,
+            shape=shape,
+            depth=depth)
+
     # q = X<=? & ~(X=? & ~(Y<?))
     def _apply_filter(self, i, fields, values, move_to):
         assert i < len(fields)
@@ -88,7 +486,27 @@ class SeekPaginator:
         q = self._apply_filter(i+1, fields, values, move_to)
         return Q(**{lf + 'e': v}) & ~(Q(**{f: v}) & ~q)
 
-    def apply_filter(self, value, pk, move_to):
+    # q = (X, Y) < (?, ?)
+    def _apply_row_filter(self, fields, values, move_to):
+        d = fields[0][1]
+        lookup = GreaterThan
+        if ((d == DESC and move_to == NEXT_PAGE) or
+                (d == ASC and move_to == PREV_PAGE)):
+            lookup = LessThan
+        return lookup(
+            _Row(*(F(f) for f, _ in fields)),
+            _Row(*(
+                v if isinstance(v, _Param) else Value(v)
+                for v in values)))
+
+    def _can_apply_row_filter(self, fields):
+        return (
+            self.filter_strategy in (ROW_VALUES_FILTER, SKIP_SCAN_FILTER) and
+            len(fields) > 1 and
+            len(set(d for _, d in fields)) == 1 and
+            connections[self.query_set.db].vendor in _ROW_VALUES_VENDORS)
+
+    def _seek_filter(self, value, pk, move_to):
         assert len(value) == len(self.lookup_fields)
         fields = list(self.fields_direction)
         values = list(value)
@@ -96,8 +514,13 @@ class SeekPaginator:
             values.append(pk)
             fields.append(
                 ('pk', fields[-1][1]))
-        q = self._apply_filter(0, fields, values, move_to)
-        return self.query_set.filter(q)
+        if self._can_apply_row_filter(fields):
+            return self._apply_row_filter(fields, values, move_to)
+        return self._apply_filter(0, fields, values, move_to)
+
+    def apply_filter(self, value, pk, move_to):
+        return self.query_set.filter(
+            self._seek_filter(value=value, pk=pk, move_to=move_to))
 
     def seek(self, value, pk, move_to):
         """
@@ -136,8 +559,24 @@ class SeekPaginator:
             X <= ?
             AND NOT (X = ? AND NOT (date <= ? AND NOT (date = ? AND id >= ?)))
 
+        Row values variant (``ROW_VALUES_FILTER``),
+        all fields must have the same order::
+
+            WHERE (X, date, id) < (?, ?, ?)
+            ORDER BY X DESC, date DESC, id DESC
+
         """
         query_set = self.query_set
+        value, all_not_none = self._prepare_value(value, pk)
+        if all_not_none:
+            query_set = self.apply_filter(
+                value=value, pk=pk, move_to=move_to)
+        query_set = query_set.order_by(
+            *self.prepare_order(
+                has_pk=pk is not _NO_PK, move_to=move_to))
+        return query_set
+
+    def _prepare_value(self, value, pk):
         if not isinstance(value, (tuple, list)):
             value = (value,)
         all_not_none = all(v is not None for v in value)
@@ -146,12 +585,252 @@ class SeekPaginator:
             'value cannot contain a None value, unless all values are None')
         if all_not_none:
             assert pk is not None, 'pk cannot be None, unless both value and pk are None'
-            query_set = self.apply_filter(
-                value=value, pk=pk, move_to=move_to)
-        query_set = query_set.order_by(
-            *self.prepare_order(
-                has_pk=pk is not _NO_PK, move_to=move_to))
-        return query_set
+        return value, all_not_none
+
+    def _uses_sql_cache(self):
+        # The raw rows skip the converters
+        # of annotations and extra selects
+        query = self.query_set.query
+        return (
+            self._sql_cache is not None and
+            self.query_set._iterable_class is ModelIterable and
+            not query.select_related and
+            not query.annotations and
+            not query.extra_select)
+
+    def _compile(self, kind, has_value, has_pk, move_to, limit):
+        size = len(self.lookup_fields)
+        value = None
+        pk = None if has_pk else _NO_PK
+        if has_value:
+            value = tuple(_Param(i) for i in range(size))
+            if has_pk:
+                pk = _Param(size)
+        query_set = self.seek(value=value, pk=pk, move_to=move_to)
+        query = query_set.query
+        if kind == _ROWS:
+            query = query_set[:limit].query
+        else:
+            query = query.exists()
+        try:
+            sql, params = query.get_compiler(using=query_set.db).as_sql()
+        except EmptyResultSet:
+            # i.e: ``none()`` or ``pk__in=[]``
+            return _SQLCacheEntry(sql=None, params=(), slots=(), fields=())
+        slots = tuple(
+            (i, p.index)
+            for i, p in enumerate(params)
+            if isinstance(p, _Param))
+        ref_query = self.query_set.query.clone()
+        fields = tuple(
+            ref_query.resolve_ref(f).output_field
+            for f in self.fields + ('pk',))
+        return _SQLCacheEntry(
+            sql=sql, params=tuple(params), slots=slots, fields=fields)
+
+    def _sql_cache_key(self, *shape):
+        if self._sql_cache is not _shared_sql_cache:
+            return shape
+        if self._sql_cache_prefix is None:
+            self._sql_cache_prefix = (_fingerprint(
+                self, self.filter_strategy, self.deferred_join,
+                tuple(self.prefix_fields)),)
+        return self._sql_cache_prefix + shape
+
+    def _cached_execute(self, kind, value, pk, move_to, limit=None):
+        value, has_value = self._prepare_value(value, pk)
+        has_pk = pk is not _NO_PK
+        key = self._sql_cache_key(kind, move_to, has_value, has_pk, limit)
+        entry = self._sql_cache.get(key)
+        if entry is None:
+            entry = self._compile(kind, has_value, has_pk, move_to, limit)
+            self._sql_cache.set(key, entry)
+        if entry.sql is None:
+            return False if kind == _EXISTS else []
+        db = self.query_set.db
+        connection = connections[db]
+        params = list(entry.params)
+        if has_value:
+            values = list(value)
+            if has_pk:
+                values.append(pk)
+            values = [
+                f.get_db_prep_value(v, connection, prepared=False)
+                for f, v in zip(entry.fields, values)]
+            for i, index in entry.slots:
+                params[i] = values[index]
+        if kind == _EXISTS:
+            with connection.cursor() as cursor:
+                cursor.execute(entry.sql, params)
+                return cursor.fetchone() is not None
+        rows = RawQuerySet(
+            entry.sql,
+            model=self.query_set.model,
+            params=params,
+            using=db)
+        if self.query_set._prefetch_related_lookups:
+            rows = rows.prefetch_related(
+                *self.query_set._prefetch_related_lookups)
+        return list(rows)
+
+    def _skip_scan_prefix(self):
+        """
+        Return the leading fields with a small
+        known domain, and their values in the
+        order of ``NEXT_PAGE``
+        """
+        model = self.query_set.model
+        prefix = []
+        branches = 1
+        # At least one field is left to range scan
+        for name, direction in self.fields_direction[:-1]:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                break
+            if field.null:
+                break
+            if field.choices:
+                values = [v for v, _ in field.flatchoices]
+                # The Python order of strings is not
+                # the one of the database collation
+                if any(isinstance(v, (str, bytes)) for v in values):
+                    break
+                values.sort()
+            elif field.get_internal_type() == 'BooleanField':
+                values = [False, True]
+            else:
+                break
+            branches *= len(values)
+            if branches > _SKIP_SCAN_MAX_BRANCHES:
+                break
+            if direction == DESC:
+                values.reverse()
+            prefix.append((name, values))
+        return prefix
+
+    def _can_skip_scan(self):
+        return (
+            self.filter_strategy == SKIP_SCAN_FILTER and
+            bool(self._skip_scan_prefix()))
+
+    def _skip_scan_query_sets(self, value, pk, move_to, limit):
+        """
+        Return the queries to run in order, until ``limit``
+        rows are fetched. That's a single ``UNION ALL`` when
+        supported, or a single seek when the ``value``
+        is not within the fields domain
+        """
+        prefix = self._skip_scan_prefix()
+        size = len(prefix)
+        names = [name for name, _ in prefix]
+        combos = list(itertools.product(*(values for _, values in prefix)))
+        if move_to == PREV_PAGE:
+            combos.reverse()
+        value, has_value = self._prepare_value(value, pk)
+        start = 0
+        if has_value:
+            if tuple(value[:size]) not in combos:
+                return [self.seek(value=value, pk=pk, move_to=move_to)[:limit]]
+            start = combos.index(tuple(value[:size]))
+        rest = copy.copy(self)
+        rest.lookup_fields = self.lookup_fields[size:]
+        branches = []
+        for i, combo in enumerate(combos[start:]):
+            rest.query_set = self.query_set.filter(**dict(zip(names, combo)))
+            branches.append(rest.seek(
+                value=value[size:] if has_value and i == 0 else None,
+                pk=pk,
+                move_to=move_to)[:limit])
+        connection = connections[self.query_set.db]
+        if (len(branches) > 1 and
+                connection.features.supports_slicing_ordering_in_compound):
+            order = [
+                f.replace('pk', self.query_set.model._meta.pk.attname)
+                if f.lstrip('-') == 'pk' else f
+                for f in self.prepare_order(
+                    has_pk=pk is not _NO_PK, move_to=move_to)]
+            return [
+                branches[0]
+                .union(*branches[1:], all=True)
+                .order_by(*order)[:limit]]
+        return branches
+
+    def _skip_scan_fetch(self, query_sets, limit):
+        rows = []
+        for query_set in query_sets:
+            rows.extend(query_set[:limit - len(rows)])
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def _plan_key(self, shape):
+        """Return the key of the ``shape`` plan"""
+        return (
+            self.query_set.db,
+            _fingerprint(self),
+            self.filter_strategy,
+            shape)
+
+    def _inspect(self, value, pk, move_to, query_set):
+        if self.plan_inspector is None:
+            return
+        shape, _ = self._shape(value=value, pk=pk, move_to=move_to)
+        self.plan_inspector.inspect(
+            shape, query_set, key=self._plan_key(shape))
+
+    def _key_values_list(self, query_set):
+        return query_set.values_list(
+            'pk', *(f for f in self.fields if f != 'pk'))
+
+    def _deferred_rows(self, pks):
+        return (
+            self.query_set
+            .filter(pk__in=pks)
+            .order_by())
+
+    def _deferred_fetch(self, query_set):
+        """
+        Fetch the pks of the sliced ``query_set``, then
+        their rows. A row deleted in between is skipped
+        """
+        pks = [pk for pk, *_ in self._key_values_list(query_set)]
+        if not pks:
+            return []
+        row_pk = self._row_pk
+        rows = {row_pk(obj): obj for obj in self._deferred_rows(pks)}
+        return [rows[pk] for pk in pks if pk in rows]
+
+    async def _adeferred_fetch(self, query_set):
+        """Async version of ``_deferred_fetch``"""
+        pks = [pk async for pk, *_ in self._key_values_list(query_set)]
+        if not pks:
+            return []
+        row_pk = self._row_pk
+        rows = {row_pk(obj): obj async for obj in self._deferred_rows(pks)}
+        return [rows[pk] for pk in pks if pk in rows]
+
+    def _exists(self, value, pk, move_to):
+        if self._uses_sql_cache():
+            return self._cached_execute(_EXISTS, value, pk, move_to)
+        return self.seek(value=value, pk=pk, move_to=move_to).exists()
+
+    def sql_cache_info(self):
+        """
+        Return the compiled queries cache ``SQLCacheInfo``.
+        For ``shared_sql_cache``, it's the shared cache info
+        """
+        if self._sql_cache is None:
+            return SQLCacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+        return self._sql_cache.info()
+
+    def sql_cache_clear(self):
+        """
+        Clear the compiled queries cache and its statistics.
+        For ``shared_sql_cache``, it clears the shared cache
+        """
+        if self._sql_cache is not None:
+            self._sql_cache.clear()
 
     def page(self, value, pk=_NO_PK, move_to=NEXT_PAGE):
         """
@@ -162,18 +841,278 @@ class SeekPaginator:
         :raises: ``EmptyPage``
         """
         assert move_to in (NEXT_PAGE, PREV_PAGE)
+        with self._measure('page', value, pk, move_to) as counters:
+            page = self._page(value, pk, move_to)
+            counters['rows'] = len(page._object_list or ())
+        return page
+
+    def _page(self, value, pk, move_to):
+        cache_key = None
+        if self.page_cache is not None:
+            cache_key = self.page_cache._key(
+                self, value=value, pk=pk, move_to=move_to)
+            page = self.page_cache.get(
+                self, value=value, pk=pk, move_to=move_to, key=cache_key)
+            if page is not None:
+                if self.read_ahead is not None:
+                    self.read_ahead.submit(page)
+                return page
+
+        query_set = None
+        if not self._uses_sql_cache():
+            query_set = self.seek(
+                value=value, pk=pk, move_to=move_to)
+
+        if self.lazy and value:
+            if query_set is None:
+                exists = self._cached_execute(
+                    _EXISTS, value=value, pk=pk, move_to=move_to)
+            else:
+                exists = query_set.exists()
+            if not exists:
+                raise EmptyPage()
+
+        page = SeekPage(
+            query_set=query_set,
+            key={'value': value, 'pk': pk},
+            move_to=move_to,
+            paginator=self)
+
+        if not self.lazy and value and not page.object_list:
+            raise EmptyPage()
+
+        if self.page_cache is not None:
+            self.page_cache.set(page, key=cache_key)
+        if self.read_ahead is not None:
+            self.read_ahead.submit(page)
+
+        return page
+
+    def pages(self, partition_field, keys, move_to=NEXT_PAGE):
+        """
+        Fetch a page for each ``partition_field`` value
+        in a single query, i.e: the latest comments of
+        many posts. The ``keys`` is a dict of partition
+        value to page key (``page.next_page()``), or
+        ``None`` for the first page.
+
+        Each partition is seeked as in ``page()``, and
+        its rows are numbered by a ``ROW_NUMBER()`` window
+        to keep up to ``per_page + 1`` rows per partition.
+        The extra row answers ``has_next`` (or ``has_previous``
+        when moving to the prev page), same as ``lookahead``.
+
+        Return a dict of partition value to ``SeekPage``.
+        Empty pages are returned, instead of raising ``EmptyPage``
+        """
+        assert move_to in (NEXT_PAGE, PREV_PAGE)
+        keys = {
+            partition: {'value': None, 'pk': _NO_PK, **(key or {})}
+            for partition, key in keys.items()}
+        if not keys:
+            return {}
+        seek = Q()
+        for partition, key in keys.items():
+            value, all_not_none = self._prepare_value(key['value'], key['pk'])
+            q = Q(**{partition_field: partition})
+            if all_not_none:
+                q &= self._seek_filter(
+                    value=value, pk=key['pk'], move_to=move_to)
+            seek |= q
+        order = self.prepare_order(
+            has_pk=any(key['pk'] is not _NO_PK for key in keys.values()),
+            move_to=move_to)
+        rows = (
+            self.query_set
+            .filter(seek)
+            .annotate(
+                _seek_partition=F(partition_field),
+                _seek_row_number=Window(
+                    RowNumber(),
+                    partition_by=F(partition_field),
+                    order_by=order))
+            .filter(_seek_row_number__lte=self.per_page + 1)
+            .order_by(*order))
+        object_lists = {partition: [] for partition in keys}
+        iterable = self.query_set._iterable_class
+        if iterable is ModelIterable:
+            for obj in rows:
+                object_lists[obj._seek_partition].append(obj)
+        else:
+            # Keep the annotations out of the rows
+            names = _row_names(self.query_set)
+            make = tuple
+            if iterable is NamedValuesListIterable:
+                make = create_namedtuple_class(*names)._make
+            for row in rows.values(*names, '_seek_partition'):
+                partition = row.pop('_seek_partition')
+                if iterable is not ValuesIterable:
+                    row = make(row[name] for name in names)
+                object_lists[partition].append(row)
+
+        pages = {}
+        for partition, key in keys.items():
+            paginator = copy.copy(self)
+            paginator.query_set = self.query_set.filter(
+                **{partition_field: partition})
+            paginator.lookahead = True
+            paginator._sql_cache = None
+            paginator.page_cache = None
+            paginator.read_ahead = None
+            page = SeekPage(
+                query_set=paginator.seek(move_to=move_to, **key),
+                key=key,
+                move_to=move_to,
+                paginator=paginator)
+            page._set_object_list(object_lists[partition])
+            pages[partition] = page
+        return pages
+
+    def iterate(
+            self, chunk_size=None, value=None, pk=None,
+            chunks=False, stop=None):
+        """
+        Walk the whole queryset in chunks of ``chunk_size``
+        rows (``per_page`` by default). Each chunk is a short
+        independent seek query, so unlike ``QuerySet.iterator()``
+        no cursor is kept open in between chunks.
+
+        The rows are always ordered and seeked by the
+        lookup fields and the pk, so rows sharing a
+        value are not skipped in between chunks.
+        Pass ``value`` and ``pk`` to resume after that key.
+
+        Yield the rows, or ``SeekPage`` chunks when
+        ``chunks=True``. The ``chunk.next_page()``
+        can be stored to resume the iteration later.
+
+        Pass a ``stop`` key to end the iteration at that
+        row (included), i.e: ``KeyRange.stop``
+        """
+        paginator = copy.copy(self)
+        paginator.per_page = chunk_size or self.per_page
+        paginator.lookahead = False
+        if stop is not None:
+            stop = {'pk': _NO_PK, **stop}
+            stop_value, _ = self._prepare_value(stop['value'], stop['pk'])
+            paginator.query_set = self.query_set.filter(~Q(
+                self._seek_filter(
+                    value=stop_value, pk=stop['pk'], move_to=NEXT_PAGE)))
+            # The query_set is no longer the cached one
+            paginator._sql_cache = None
+        key = {'value': value, 'pk': pk}
+        while True:
+            query_set = None
+            if not paginator._uses_sql_cache():
+                query_set = paginator.seek(move_to=NEXT_PAGE, **key)
+            page = SeekPage(
+                query_set=query_set,
+                key=key,
+                move_to=NEXT_PAGE,
+                paginator=paginator)
+            if not page.object_list:
+                return
+            if chunks:
+                yield page
+            else:
+                yield from page.object_list
+            if len(page.object_list) < paginator.per_page:
+                return
+            key = {'pk': _NO_PK, **page.next_page()}
+
+    def key_ranges(self, count):
+        """
+        Split the queryset into up to ``count`` contiguous
+        ``KeyRange`` of about the same number of rows.
+        This runs a ``count()`` of the whole queryset, and
+        then a probe per boundary. Each probe seeks from the
+        previous boundary key and skips ``rows / count`` rows
+        by ``OFFSET``, so it reads that many rows. The whole
+        split reads about twice the queryset rows.
+
+        Each range can be scanned in a different process
+        or thread with ``iterate(stop=key_range.stop,
+        **key_range.start)`` or ``scan_key_ranges()``.
+        The keys always contain the ``pk``. The first
+        range starts at ``{'value': None, 'pk': None}``,
+        and the last one stops at ``None``
+        """
+        assert isinstance(count, int) and count > 0, 'Positive int expected'
+        total = self.query_set.count()
+        step = -(-total // count)  # ceil
+        start = {'value': None, 'pk': None}
+        if not step:
+            return [KeyRange(start=start, stop=None)]
+        fields = self.fields + ('pk',)
+        result = []
+        for _ in range(-(-total // step) - 1):
+            boundary = list(
+                self.seek(move_to=NEXT_PAGE, **start)
+                .values_list(*fields)[step-1:step])
+            if not boundary:
+                break
+            (*value, pk), = boundary
+            stop = {'value': tuple(value), 'pk': pk}
+            result.append(KeyRange(start=start, stop=stop))
+            start = stop
+        result.append(KeyRange(start=start, stop=None))
+        return result
+
+    def scan_key_ranges(
+            self, func, key_ranges, chunk_size=None, max_workers=None):
+        """
+        Call ``func(rows)`` for each ``KeyRange`` in a pool of
+        threads, where ``rows`` is ``iterate()`` over the range.
+        Each thread has its own DB connection, and it's closed
+        once the scan is done. Return the results in order
+        """
+        def scan(key_range):
+            try:
+                return func(self.iterate(
+                    chunk_size=chunk_size,
+                    stop=key_range.stop,
+                    **key_range.start))
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(scan, key_ranges))
+
+    async def apage(self, value, pk=_NO_PK, move_to=NEXT_PAGE):
+        """
+        Async version of ``page``.
+        The compiled queries cache is not used.
+        The ``page_cache``, ``read_ahead``, ``instrument``,
+        ``plan_inspector`` and ``SKIP_SCAN_FILTER`` are
+        not supported
+
+        :raises: ``EmptyPage``
+        """
+        assert move_to in (NEXT_PAGE, PREV_PAGE)
+        assert self.page_cache is None, 'apage() does not support page_cache'
+        assert self.read_ahead is None, 'apage() does not support read_ahead'
+        assert self.instrument is None, 'apage() does not support instrument'
+        assert self.plan_inspector is None, (
+            'apage() does not support plan_inspector')
+        assert self.filter_strategy != SKIP_SCAN_FILTER, (
+            'apage() does not support SKIP_SCAN_FILTER')
         query_set = self.seek(
             value=value, pk=pk, move_to=move_to)
 
-        if value and not query_set.exists():
+        if self.lazy and value and not await query_set.aexists():
             raise EmptyPage()
 
-        return SeekPage(
+        page = SeekPage(
             query_set=query_set,
             key={'value': value, 'pk': pk},
             move_to=move_to,
             paginator=self)
 
+        if not self.lazy and value and not await page.aobject_list():
+            raise EmptyPage()
+
+        return page
+
 
 class SeekPage(Sequence):
     def __init__(self, query_set, key, move_to, paginator):
@@ -181,6 +1120,9 @@ class SeekPage(Sequence):
         self._key = key
         self._move_to = move_to
         self._object_list = None
+        self._has_next = None
+        self._has_previous = None
+        self._metadata = {}
         self.paginator = paginator
 
     def __repr__(self):
@@ -192,45 +1134,143 @@ class SeekPage(Sequence):
     def __getitem__(self, index):
         return self.object_list[index]
 
+    async def __aiter__(self):
+        for obj in await self.aobject_list():
+            yield obj
+
+    def _fetch_limit(self):
+        if self.paginator.lookahead:
+            # The extra row tells whether there
+            # is a page after this one
+            return self.paginator.per_page + 1
+        return self.paginator.per_page
+
+    def _set_object_list(self, object_list):
+        per_page = self.paginator.per_page
+        if self.paginator.lookahead:
+            has_more = len(object_list) > per_page
+            del object_list[per_page:]
+            if self._move_to == NEXT_PAGE:
+                self._has_next = has_more
+            else:
+                self._has_previous = has_more
+        if self._move_to == PREV_PAGE:
+            object_list.reverse()
+        self._object_list = object_list
+
     @property
     def object_list(self):
-        if self._object_list is not None:
-            return self._object_list
-        # We could fetch an extra item an
-        # save a query on has_prev/next_page,
-        # but meh, the query for hax_X should be fairly cheap
-        self._object_list = list(self._query_set[:self.paginator.per_page])
-        if self._move_to == PREV_PAGE:
-            self._object_list.reverse()
+        if self._object_list is None:
+            self._set_object_list(self._fetch(self._fetch_limit()))
         return self._object_list
 
-    def _some_seek(self, direction):
+    async def aobject_list(self):
+        """Async version of ``object_list``"""
+        if self._object_list is None:
+            qs = self._query_set
+            if qs is None:
+                # i.e: a page of the compiled queries cache
+                qs = self.paginator.seek(move_to=self._move_to, **self._key)
+            qs = qs[:self._fetch_limit()]
+            if self.paginator.deferred_join:
+                object_list = await self.paginator._adeferred_fetch(qs)
+            else:
+                object_list = [obj async for obj in qs]
+            self._set_object_list(object_list)
+        return self._object_list
+
+    @_measured('object_list')
+    def _fetch(self, limit):
+        paginator = self.paginator
+        if paginator._can_skip_scan():
+            query_sets = paginator._skip_scan_query_sets(
+                value=self._key['value'],
+                pk=self._key['pk'],
+                move_to=self._move_to,
+                limit=limit)
+            paginator._inspect(
+                move_to=self._move_to, query_set=query_sets[0], **self._key)
+            return paginator._skip_scan_fetch(query_sets, limit)
+        query_set = self._query_set
+        if query_set is None and (
+                paginator.deferred_join or
+                paginator.plan_inspector is not None):
+            query_set = paginator.seek(move_to=self._move_to, **self._key)
+        if paginator.plan_inspector is not None:
+            inspected = query_set[:limit]
+            if paginator.deferred_join:
+                inspected = paginator._key_values_list(inspected)
+            paginator._inspect(
+                move_to=self._move_to, query_set=inspected, **self._key)
+        if paginator.deferred_join:
+            return paginator._deferred_fetch(query_set[:limit])
+        if self._query_set is None:
+            return self.paginator._cached_execute(
+                _ROWS,
+                value=self._key['value'],
+                pk=self._key['pk'],
+                move_to=self._move_to,
+                limit=limit)
+        return list(self._query_set[:limit])
+
+    def _some_key(self, direction):
         assert self.object_list
         assert direction in (NEXT_PAGE, PREV_PAGE)
         last = self.object_list[0]
         if direction == NEXT_PAGE:
             last = self.object_list[-1]
-        pk = _NO_PK
-        if self._key['pk'] is not _NO_PK:
-            pk = last.pk
-        values = tuple(
-            getattr(last, f)
-            for f in self.paginator.fields)
+        values, pk = self.paginator._row_key(last)
+        if self._key['pk'] is _NO_PK:
+            pk = _NO_PK
+        return values, pk
+
+    def _some_seek(self, direction):
+        values, pk = self._some_key(direction)
         return self.paginator.seek(
             value=values,
             pk=pk,
             move_to=direction)
 
+    def _some_exists(self, direction):
+        values, pk = self._some_key(direction)
+        return self.paginator._exists(
+            value=values,
+            pk=pk,
+            move_to=direction)
+
+    @_measured('has_next')
     def has_next(self):
         if not self.object_list:
             return False
-        return self._some_seek(NEXT_PAGE).exists()
+        if self._has_next is None:
+            self._has_next = self._some_exists(NEXT_PAGE)
+        return self._has_next
 
+    @_measured('has_previous')
     def has_previous(self):
         if not self.object_list:
             return False
-        return self._some_seek(PREV_PAGE).exists()
+        if self._has_previous is None:
+            self._has_previous = self._some_exists(PREV_PAGE)
+        return self._has_previous
+
+    async def ahas_next(self):
+        """Async version of ``has_next``"""
+        if not await self.aobject_list():
+            return False
+        if self._has_next is None:
+            self._has_next = await self._some_seek(NEXT_PAGE).aexists()
+        return self._has_next
+
+    async def ahas_previous(self):
+        """Async version of ``has_previous``"""
+        if not await self.aobject_list():
+            return False
+        if self._has_previous is None:
+            self._has_previous = await self._some_seek(PREV_PAGE).aexists()
+        return self._has_previous
 
+    @_measured('next_objects_left')
     def next_objects_left(self, limit=None):
         """Return the number of next records"""
         if not self.object_list:
@@ -240,6 +1280,7 @@ class SeekPage(Sequence):
             qs = qs[:limit]
         return qs.count()
 
+    @_measured('prev_objects_left')
     def prev_objects_left(self, limit=None):
         """Return the number of prev records"""
         if not self.object_list:
@@ -249,6 +1290,22 @@ class SeekPage(Sequence):
             qs = qs[:limit]
         return qs.count()
 
+    async def _asome_objects_left(self, direction, limit):
+        if not await self.aobject_list():
+            return 0
+        qs = self._some_seek(direction)
+        if limit:
+            qs = qs[:limit]
+        return await qs.acount()
+
+    async def anext_objects_left(self, limit=None):
+        """Async version of ``next_objects_left``"""
+        return await self._asome_objects_left(NEXT_PAGE, limit)
+
+    async def aprev_objects_left(self, limit=None):
+        """Async version of ``prev_objects_left``"""
+        return await self._asome_objects_left(PREV_PAGE, limit)
+
     def _some_pages_left(self, direction, limit):
         some_objects_left = self.prev_objects_left
         if direction == NEXT_PAGE:
@@ -256,23 +1313,150 @@ class SeekPage(Sequence):
         limit = (limit or 0) * self.paginator.per_page
         return (-some_objects_left(limit) // self.paginator.per_page) * -1  # ceil
 
+    async def _asome_pages_left(self, direction, limit):
+        limit = (limit or 0) * self.paginator.per_page
+        objects_left = await self._asome_objects_left(direction, limit)
+        return (-objects_left // self.paginator.per_page) * -1  # ceil
+
+    @_measured('next_pages_left')
     def next_pages_left(self, limit=None):
         """Return the number of next pages"""
         return self._some_pages_left(NEXT_PAGE, limit)
 
+    @_measured('prev_pages_left')
     def prev_pages_left(self, limit=None):
         """Return the number of prev pages"""
         return self._some_pages_left(PREV_PAGE, limit)
 
+    async def anext_pages_left(self, limit=None):
+        """Async version of ``next_pages_left``"""
+        return await self._asome_pages_left(NEXT_PAGE, limit)
+
+    async def aprev_pages_left(self, limit=None):
+        """Async version of ``prev_pages_left``"""
+        return await self._asome_pages_left(PREV_PAGE, limit)
+
+    def _some_objects_estimate(self, direction, threshold):
+        if not self.object_list:
+            return Estimate(value=0, exact=True, threshold=threshold)
+        qs = self._some_seek(direction)
+        count = qs[:threshold + 1].count()
+        if count <= threshold:
+            return Estimate(value=count, exact=True, threshold=threshold)
+        return Estimate(
+            value=max(_planner_rows(qs) or 0, threshold + 1),
+            exact=False,
+            threshold=threshold)
+
+    @_measured('next_objects_estimate')
+    def next_objects_estimate(self, threshold=1000):
+        """
+        Return the ``Estimate`` of next records. It's
+        exact up to ``threshold`` records, so it only
+        counts that many rows. Past that, it's the
+        planner estimate of the next records
+        """
+        return self._some_objects_estimate(NEXT_PAGE, threshold)
+
+    @_measured('prev_objects_estimate')
+    def prev_objects_estimate(self, threshold=1000):
+        """Same as ``next_objects_estimate`` for prev records"""
+        return self._some_objects_estimate(PREV_PAGE, threshold)
+
+    def _some_pages_estimate(self, direction, threshold):
+        per_page = self.paginator.per_page
+        estimate = self._some_objects_estimate(
+            direction, threshold * per_page)
+        return Estimate(
+            value=(-estimate.value // per_page) * -1,  # ceil
+            exact=estimate.exact,
+            threshold=threshold)
+
+    @_measured('next_pages_estimate')
+    def next_pages_estimate(self, threshold=100):
+        """
+        Return the ``Estimate`` of next pages,
+        exact up to ``threshold`` pages
+        """
+        return self._some_pages_estimate(NEXT_PAGE, threshold)
+
+    @_measured('prev_pages_estimate')
+    def prev_pages_estimate(self, threshold=100):
+        """Same as ``next_pages_estimate`` for prev pages"""
+        return self._some_pages_estimate(PREV_PAGE, threshold)
+
+    def _some_count_sql(self, direction, limit):
+        qs = self._some_seek(direction).order_by().values('pk')
+        if limit:
+            qs = qs[:limit]
+        return qs.query.get_compiler(using=qs.db).as_sql()
+
+    @_measured('metadata')
+    def metadata(self, limit=None):
+        """
+        Return a dict of ``has_next``, ``has_previous``,
+        ``next_objects_left``, ``prev_objects_left``,
+        ``next_pages_left`` and ``prev_pages_left``.
+        The ``limit`` has the same meaning as in
+        the ``*_left`` methods.
+
+        This runs a single query, and the
+        result is memoized for the given limit
+        """
+        if limit in self._metadata:
+            return self._metadata[limit]
+        per_page = self.paginator.per_page
+        next_count, prev_count = 0, 0
+        if self.object_list:
+            # Count up to the pages limit, the
+            # objects limit is the lowest of both
+            count_limit = (limit or 0) * per_page
+            next_sql, next_params = self._some_count_sql(NEXT_PAGE, count_limit)
+            prev_sql, prev_params = self._some_count_sql(PREV_PAGE, count_limit)
+            connection = connections[self.paginator.query_set.db]
+            sql = (
+                'SELECT '
+                '(SELECT COUNT(*) FROM (%s) next_objects), '
+                '(SELECT COUNT(*) FROM (%s) prev_objects)%s' % (
+                    next_sql, prev_sql,
+                    connection.features.bare_select_suffix))
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (*next_params, *prev_params))
+                next_count, prev_count = cursor.fetchone()
+        return self._set_metadata(limit, next_count, prev_count)
+
+    async def ametadata(self, limit=None):
+        """
+        Async version of ``metadata``,
+        it runs the same single query
+        """
+        if limit in self._metadata:
+            return self._metadata[limit]
+        await self.aobject_list()
+        return await sync_to_async(self.metadata)(limit)
+
+    def _set_metadata(self, limit, next_count, prev_count):
+        per_page = self.paginator.per_page
+        if self._object_list:
+            self._has_next = next_count > 0
+            self._has_previous = prev_count > 0
+        objects_limit = limit or max(next_count, prev_count)
+        self._metadata[limit] = {
+            'has_next': next_count > 0,
+            'has_previous': prev_count > 0,
+            'next_objects_left': min(next_count, objects_limit),
+            'prev_objects_left': min(prev_count, objects_limit),
+            'next_pages_left': (-next_count // per_page) * -1,  # ceil
+            'prev_pages_left': (-prev_count // per_page) * -1}
+        return self._metadata[limit]
+
     def _some_page(self, index):
         if not self.object_list:
             return {}
-        values = tuple(
-            getattr(self.object_list[index], f)
-            for f in self.paginator.fields)
+        values, pk = self.paginator._row_key(self.object_list[index])
         key = {'value': values}
         if self._key['pk'] is not _NO_PK:
-            key['pk'] = self.object_list[index].pk
+            key['pk'] = pk
         return key
 
     def next_page(self):
@@ -284,14 +1468,51 @@ class SeekPage(Sequence):
         return self._some_page(0)
 
 
-def paginate(query_set, per_page, lookup_field, value, pk=_NO_PK, move_to=NEXT_PAGE):
-    """Return a ``SeekPage`` containing the paginated result"""
+def paginate(
+        query_set, per_page, lookup_field, value,
+        pk=_NO_PK, move_to=NEXT_PAGE, lookahead=False, lazy=True,
+        filter_strategy=Q_FILTER, prefix_fields=None,
+        deferred_join=False, shared_sql_cache=False):
+    """
+    Return a ``SeekPage`` containing the paginated result.
+    Pass ``shared_sql_cache=True`` to reuse the compiled
+    SQL across calls, see ``SeekPaginator``
+    """
     return (
         SeekPaginator(
             query_set=query_set,
             per_page=per_page,
-            lookup_field=lookup_field)
+            lookup_field=lookup_field,
+            lookahead=lookahead,
+            lazy=lazy,
+            filter_strategy=filter_strategy,
+            prefix_fields=prefix_fields,
+            deferred_join=deferred_join,
+            shared_sql_cache=shared_sql_cache)
         .page(
             value=value,
             pk=pk,
             move_to=move_to))
+
+
+async def apaginate(
+        query_set, per_page, lookup_field, value,
+        pk=_NO_PK, move_to=NEXT_PAGE, lookahead=False, lazy=True,
+        filter_strategy=Q_FILTER, prefix_fields=None,
+        deferred_join=False, shared_sql_cache=False):
+    """Async version of ``paginate``"""
+    return await (
+        SeekPaginator(
+            query_set=query_set,
+            per_page=per_page,
+            lookup_field=lookup_field,
+            lookahead=lookahead,
+            lazy=lazy,
+            filter_strategy=filter_strategy,
+            prefix_fields=prefix_fields,
+            deferred_join=deferred_join,
+            shared_sql_cache=shared_sql_cache)
+        .apage(
+            value=value,
+            pk=pk,
+            move_to=move_to))
@@ -1,19 +1,38 @@
 #-*- coding: utf-8 -*-
 
 import re
-from datetime import datetime, timezone as tz
+import struct
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime, timedelta, timezone as tz
+from decimal import Decimal, InvalidOperation
+from uuid import UUID
 
 from django.core.paginator import InvalidPage
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
 from django.conf import settings
 
 __all__ = [
     'page_key',
     'to_page_key',
+    'to_cursor',
+    'from_cursor',
     'InvalidPage']
 
 PAGE_RE = re.compile(r'^(?P<value>[0-9]+\.[0-9]{6})-(?P<pk>[0-9]+)$')
 
+CURSOR_VERSION = 1
+CURSOR_MAX_LENGTH = 1024
+_CURSOR_SALT = 'infinite_scroll_pagination.serializers.cursor'
+_SIGNATURE_SIZE = 12
+_HAS_PK = 0x01
+_FALSE, _TRUE, _INT, _FLOAT, _DECIMAL, _STR, _DATE, _DATETIME, \
+    _DATETIME_TZ, _UUID = range(1, 11)
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_TZ = datetime(1970, 1, 1, tzinfo=tz.utc)
+_DOUBLE = struct.Struct('>d')
+
 
 def _make_aware_maybe(dt):
     if not getattr(settings, 'USE_TZ', False):
@@ -57,3 +76,187 @@ def to_page_key(value=None, pk=None):
     value = _make_aware_maybe(value)
     timestamp = value.timestamp()
     return '{:.6f}-{}'.format(timestamp, pk)
+
+
+def _pack_uint(out, n):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _pack_int(out, n):
+    _pack_uint(out, n * 2 if n >= 0 else -n * 2 - 1)  # zigzag
+
+
+def _pack_bytes(out, data):
+    _pack_uint(out, len(data))
+    out.extend(data)
+
+
+def _microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _pack(out, value):
+    # Order matters, bool is an int,
+    # and datetime is a date
+    if value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _pack_int(out, value)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out.extend(_DOUBLE.pack(value))
+    elif isinstance(value, Decimal):
+        out.append(_DECIMAL)
+        _pack_bytes(out, str(value).encode('ascii'))
+    elif isinstance(value, str):
+        out.append(_STR)
+        _pack_bytes(out, value.encode('utf-8'))
+    elif isinstance(value, datetime):
+        if timezone.is_aware(value):
+            out.append(_DATETIME_TZ)
+            _pack_int(out, _microseconds(value - _EPOCH_TZ))
+        else:
+            out.append(_DATETIME)
+            _pack_int(out, _microseconds(value - _EPOCH))
+    elif isinstance(value, date):
+        out.append(_DATE)
+        _pack_int(out, value.toordinal())
+    elif isinstance(value, UUID):
+        out.append(_UUID)
+        out.extend(value.bytes)
+    else:
+        raise TypeError(
+            'Unsupported cursor value type %s' % type(value).__name__)
+
+
+def _unpack_uint(data, i):
+    n = 0
+    shift = 0
+    while True:
+        b = data[i]
+        i += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def _unpack_int(data, i):
+    n, i = _unpack_uint(data, i)
+    return (n >> 1) ^ -(n & 1), i
+
+
+def _unpack_bytes(data, i):
+    size, i = _unpack_uint(data, i)
+    if i + size > len(data):
+        raise ValueError('Truncated data')
+    return data[i:i+size], i + size
+
+
+def _unpack(data, i):
+    tag = data[i]
+    i += 1
+    if tag == _TRUE:
+        return True, i
+    if tag == _FALSE:
+        return False, i
+    if tag == _INT:
+        return _unpack_int(data, i)
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, i)[0], i + _DOUBLE.size
+    if tag == _DECIMAL:
+        value, i = _unpack_bytes(data, i)
+        return Decimal(value.decode('ascii')), i
+    if tag == _STR:
+        value, i = _unpack_bytes(data, i)
+        return value.decode('utf-8'), i
+    if tag == _DATETIME:
+        value, i = _unpack_int(data, i)
+        return _EPOCH + timedelta(microseconds=value), i
+    if tag == _DATETIME_TZ:
+        value, i = _unpack_int(data, i)
+        return _EPOCH_TZ + timedelta(microseconds=value), i
+    if tag == _DATE:
+        value, i = _unpack_int(data, i)
+        return date.fromordinal(value), i
+    if tag == _UUID:
+        if i + 16 > len(data):
+            raise ValueError('Truncated data')
+        return UUID(bytes=bytes(data[i:i+16])), i + 16
+    raise ValueError('Unknown type')
+
+
+def _signature(payload):
+    return salted_hmac(_CURSOR_SALT, payload).digest()[:_SIGNATURE_SIZE]
+
+
+def to_cursor(value=None, pk=None, signed=False):
+    """
+    Serialize a value and pk to a compact URL-safe
+    cursor. The value may be a tuple of bool, int,
+    float, Decimal, str, date, datetime and UUID,
+    and so the pk. Pass ``signed=True`` to append
+    a HMAC signature (see ``from_cursor``).
+    This takes the ``page.next_page()`` output
+    """
+    if value is None:
+        return ''
+    if not isinstance(value, (tuple, list)):
+        value = (value,)
+    out = bytearray((CURSOR_VERSION, 0))
+    _pack_uint(out, len(value))
+    for v in value:
+        _pack(out, v)
+    if pk is not None:
+        out[1] |= _HAS_PK
+        _pack(out, pk)
+    if signed:
+        out.extend(_signature(bytes(out)))
+    return urlsafe_b64encode(out).rstrip(b'=').decode('ascii')
+
+
+def from_cursor(raw_cursor, signed=False):
+    """
+    Parse a cursor made by ``to_cursor``.
+    Return a dict of ``value`` tuple and
+    ``pk`` (if any), to pass to ``page()``.
+    Pass ``signed=True`` to verify the signature
+
+    :raises: ``InvalidPage``
+    """
+    if not raw_cursor:
+        return {'value': None, 'pk': None}
+    if len(raw_cursor) > CURSOR_MAX_LENGTH:
+        raise InvalidPage('Bad cursor format')
+    try:
+        data = urlsafe_b64decode(raw_cursor + '=' * (-len(raw_cursor) % 4))
+    except (binascii.Error, ValueError):
+        raise InvalidPage('Bad cursor format')
+    if signed:
+        data, signature = data[:-_SIGNATURE_SIZE], data[-_SIGNATURE_SIZE:]
+        if not constant_time_compare(signature, _signature(data)):
+            raise InvalidPage('Bad cursor signature')
+    try:
+        if data[0] != CURSOR_VERSION:
+            raise InvalidPage('Unsupported cursor version')
+        flags = data[1]
+        size, i = _unpack_uint(data, 2)
+        value = []
+        for _ in range(size):
+            v, i = _unpack(data, i)
+            value.append(v)
+        result = {'value': tuple(value)}
+        if flags & _HAS_PK:
+            result['pk'], i = _unpack(data, i)
+    except (IndexError, ValueError, OverflowError, struct.error,
+            InvalidOperation, UnicodeDecodeError):
+        raise InvalidPage('Bad cursor format')
+    if i != len(data) or not value:
+        raise InvalidPage('Bad cursor format')
+    return result
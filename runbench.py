@@ -1,24 +1,24 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import datetime
+import sys
+import argparse
 
 import django
 from django.conf import settings
-from django.utils import timezone
 from django.core.management import call_command
 
 
-def django_setup():
+def django_setup(args):
     settings.configure(
         DATABASES={
             'default': {
-                'ENGINE': 'django.db.backends.postgresql_psycopg2',
-                'NAME': 'postgres',
-                'USER': 'postgres',
-                'PASSWORD': 'postgres',
-                'HOST': 'database',
-                'PORT': '5432',
+                'ENGINE': args.engine,
+                'NAME': args.name,
+                'USER': args.user,
+                'PASSWORD': args.password,
+                'HOST': args.host,
+                'PORT': args.port,
             }
         },
         INSTALLED_APPS=[
@@ -26,84 +26,127 @@ def django_setup():
         ],
         ROOT_URLCONF="tests.urls",
         DEBUG=False,
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD='django.db.models.AutoField',
     )
     django.setup()
-    call_command('migrate')
+    call_command('migrate', verbosity=0)
 
-#from tests.models import Article
-#from infinite_scroll_pagination.paginator import SeekPaginator
-#from infinite_scroll_pagination import paginator as inf_paginator
 
-def populate_db():
-    from tests.models import Article
-    if Article.objects.all().count() > 0:
-        print('Some records found; skipping')
+def _ints(value):
+    return tuple(int(v) for v in value.split(','))
+
+
+def _floats(value):
+    return tuple(float(v) for v in value.split(','))
+
+
+def _strs(value):
+    return tuple(value.split(','))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the seek method against offset/limit')
+    db = parser.add_argument_group('database')
+    db.add_argument('--engine', default='django.db.backends.sqlite3')
+    db.add_argument('--name', default='bench.sqlite3')
+    db.add_argument('--user', default='')
+    db.add_argument('--password', default='')
+    db.add_argument('--host', default='')
+    db.add_argument('--port', default='')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    dataset = argparse.ArgumentParser(add_help=False)
+    dataset.add_argument('--seed', type=int, default=0)
+    dataset.add_argument(
+        '--duplicates', type=int, default=10,
+        help='rows sharing the same date')
+    dataset.add_argument(
+        '--pinned', type=float, default=0.01,
+        help='fraction of pinned rows')
+    dataset.add_argument(
+        '--sticky', type=float, default=0.05,
+        help='fraction of sticky rows')
+    dataset.add_argument('--batch-size', type=int, default=10_000)
+
+    populate = commands.add_parser(
+        'populate', parents=[dataset], help='only populate the database')
+    populate.add_argument('--size', type=int, default=1_000_000)
+
+    run = commands.add_parser(
+        'run', parents=[dataset], help='run the benchmarks')
+    run.add_argument('--sizes', type=_ints, default=(10_000, 100_000))
+    run.add_argument('--shapes', type=_strs, default=None)
+    run.add_argument('--per-pages', type=_ints, default=(10, 50))
+    run.add_argument('--depths', type=_floats, default=(0.1, 0.5, 0.9))
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--output', help='write the results as JSON')
+
+    micro = commands.add_parser(
+        'micro', help=(
+            'run the Python overhead microbenchmarks, '
+            'the database is always an in-memory SQLite'))
+    micro.add_argument('--fields', type=_ints, default=(1, 2, 4, 8))
+    micro.add_argument('--number', type=int, default=1000)
+    micro.add_argument('--repeat', type=int, default=5)
+    micro.add_argument('--output', help='write the results as JSON')
+
+    compare = commands.add_parser(
+        'compare', help='flag the regressions against a baseline')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='slowdown of the median to flag, 0.2 is 20%%')
+    return parser.parse_args(argv)
+
+
+def start(argv=None):
+    args = parse_args(argv)
+    from bench import suite
+    if args.command == 'compare':
+        regressions = suite.compare(
+            suite.load(args.baseline),
+            suite.load(args.current),
+            threshold=args.threshold)
+        if regressions:
+            print('Regressions found')
+            suite.print_results(regressions)
+            sys.exit(1)
+        print('No regressions found')
+        return
+    if args.command == 'micro':
+        args.engine = 'django.db.backends.sqlite3'
+        args.name = ':memory:'
+        django_setup(args)
+        from bench import micro
+        data = micro.run(
+            fields=args.fields, number=args.number, repeat=args.repeat)
+        suite.print_results(data['results'])
+        if args.output:
+            suite.dump(data, args.output)
+        return
+    django_setup(args)
+    dataset_options = {
+        'seed': args.seed,
+        'duplicates': args.duplicates,
+        'pinned': args.pinned,
+        'sticky': args.sticky,
+        'batch_size': args.batch_size}
+    if args.command == 'populate':
+        suite.populate(args.size, **dataset_options)
         return
-    Article.objects.all().delete()
-    date = timezone.now()
-    # change to range(5) to create 5M records
-    for n in range(1):
-        articles = []
-        for i in range(1_000_000):
-            seconds = datetime.timedelta(microseconds=i+1_000_000*n)
-            articles.append(Article(
-                title="%s" % (i+1_000_000*n), date=date, date_unique=date + seconds))
-        Article.objects.bulk_create(articles)
-
-
-def bench():
-    from timeit import default_timer as timer
-    from django.core.paginator import Paginator
-    from tests.models import Article
-    from infinite_scroll_pagination.paginator import SeekPaginator
-    articles = Article.objects.all().order_by(
-        '-is_pinned', '-is_sticky', "-date", '-pk')
-    #'-is_pinned', '-is_sticky',
-    for a in articles[:5]:
-        a.is_pinned = True
-        a.save()
-    for a in articles[10:15]:
-        a.is_pinned = True
-        a.is_sticky = True
-        a.save()
-    for a in articles[810_000:810_050]:
-        a.is_pinned = True
-        a.save()
-    for a in articles[510_000:510_050]:
-        a.is_pinned = True
-        a.save()
-    for a in articles[910_000:910_050]:
-        a.is_sticky = True
-        a.save()
-
-    start = timer()
-    article1 = list(articles[800_000:800_010])[0]
-    #article1 = list(articles[4_000_000:4_000_010])[0]
-    end = timer()
-    print("Offset/Limit", end - start)
-
-    start = timer()
-    paginator = SeekPaginator(
-        Article.objects.all(),
-        per_page=10,
-        lookup_field=('-is_pinned', '-is_sticky', '-date',))
-    page = paginator.page(
-        value=(
-            article1.is_pinned,
-            article1.is_sticky,
-            article1.date,),
-        pk=article1.pk)
-    assert list(page)
-    end = timer()
-    print("Seek Method", end - start)
-
-
-def start():
-    django_setup()
-    print('Populating DB')
-    populate_db()
-    print('Running bench')
-    bench()
+    data = suite.run(
+        sizes=args.sizes,
+        shapes=args.shapes or tuple(suite.SHAPES),
+        per_pages=args.per_pages,
+        depths=args.depths,
+        repeat=args.repeat,
+        dataset_options=dataset_options)
+    suite.print_results(data['results'])
+    if args.output:
+        suite.dump(data, args.output)
 
 
 if __name__ == "__main__":
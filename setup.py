@@ -25,6 +25,8 @@ setup(
     url=URL,
     packages=[
         'infinite_scroll_pagination',
+        'infinite_scroll_pagination.management',
+        'infinite_scroll_pagination.management.commands',
     ],
     include_package_data=True,
     zip_safe=False,
@@ -0,0 +1,134 @@
+#-*- coding: utf-8 -*-
+
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from .models import Article
+from infinite_scroll_pagination.paginator import SeekPaginator
+from infinite_scroll_pagination.advisor import advise, _matches
+from infinite_scroll_pagination.management.commands import (
+    seek_index_advisor)
+
+
+class AdvisorTest(TestCase):
+
+    def advise(self, lookup_field):
+        return advise(SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field=lookup_field))
+
+    def test_unique(self):
+        advice = self.advise('-date_unique')
+        self.assertEqual(advice.fields, ['-date_unique', '-id'])
+        self.assertIsNotNone(advice.index_name)
+        self.assertIsNotNone(self.advise('date_unique').index_name)
+        self.assertIsNotNone(self.advise('-id').index_name)
+        self.assertEqual(self.advise('-id').fields, ['-id'])
+
+    def test_missing(self):
+        advice = self.advise(('-is_pinned', '-date'))
+        self.assertIsNone(advice.index_name)
+        self.assertEqual(advice.fields, ['-is_pinned', '-date', '-id'])
+        self.assertRegex(
+            advice.index,
+            r"^models\.Index\(fields=\['-is_pinned', '-date', '-id'\], "
+            r"name='tests_artic_\w+'\)$")
+        self.assertEqual(
+            advice.operation,
+            "migrations.AddIndex(model_name='article', index=%s)" % (
+                advice.index,))
+
+    def test_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX seek_idx ON tests_article '
+                '(is_pinned DESC, date DESC, id DESC)')
+        self.assertEqual(
+            self.advise(('-is_pinned', '-date')).index_name, 'seek_idx')
+        self.assertEqual(
+            self.advise(('is_pinned', 'date')).index_name, 'seek_idx')
+        self.assertIsNone(self.advise(('is_pinned', '-date')).index_name)
+        self.assertIsNone(self.advise(('-date', '-is_pinned')).index_name)
+
+    def test_matches(self):
+        constraint = {
+            'columns': ['a', 'b'],
+            'orders': ['DESC', 'ASC'],
+            'unique': False,
+            'primary_key': False}
+        self.assertTrue(_matches(constraint, [('a', True), ('b', False)]))
+        self.assertTrue(_matches(constraint, [('a', False), ('b', True)]))
+        self.assertTrue(_matches(constraint, [('a', True)]))
+        self.assertFalse(_matches(constraint, [('a', True), ('b', True)]))
+        self.assertFalse(_matches(
+            constraint, [('a', True), ('b', False), ('id', False)]))
+        constraint['unique'] = True
+        self.assertTrue(_matches(
+            constraint, [('a', True), ('b', False), ('id', False)]))
+        constraint = {
+            'columns': ['date'],
+            'orders': ['ASC'],
+            'unique': False,
+            'primary_key': False}
+        # A non-unique index is not a prefix of the ordering
+        self.assertFalse(_matches(constraint, [('date', False), ('id', False)]))
+        self.assertTrue(_matches(constraint, [('date', False)]))
+        constraint['columns'] = ['date', 'id', 'title']
+        constraint['orders'] = ['ASC', 'ASC', 'ASC']
+        self.assertTrue(_matches(constraint, [('date', False), ('id', False)]))
+
+    def test_non_unique_prefix_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX "date_idx" ON "tests_article" ("date" DESC)')
+        self.assertIsNone(self.advise('-date').index_name)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command(
+            seek_index_advisor.Command(), 'tests.Article',
+            '--lookup-field=-is_pinned,-date', stdout=out)
+        self.assertIn('No matching index', out.getvalue())
+        self.assertIn('models.Index(', out.getvalue())
+        self.assertIn('migrations.AddIndex(', out.getvalue())
+        self.assertRaises(
+            CommandError, call_command, seek_index_advisor.Command(),
+            'tests.Article', '--lookup-field=-is_pinned,-date', check=True,
+            stdout=io.StringIO())
+        out = io.StringIO()
+        call_command(
+            seek_index_advisor.Command(), 'tests.Article',
+            '--lookup-field=-date_unique', check=True, stdout=out)
+        self.assertIn('Matching index', out.getvalue())
+        self.assertRaises(
+            CommandError, call_command, seek_index_advisor.Command(),
+            'tests.Article', '--lookup-field=foo', stdout=io.StringIO())
+        self.assertRaises(
+            CommandError, call_command, seek_index_advisor.Command(),
+            'tests.Foo', '--lookup-field=foo', stdout=io.StringIO())
+
+    def test_command_prefix_field(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX "seek_idx" ON "tests_article" '
+                '("is_sticky", "is_pinned", "date" DESC, "id" DESC)')
+        out = io.StringIO()
+        call_command(
+            seek_index_advisor.Command(), 'tests.Article',
+            '--lookup-field=-date', '--prefix-field=is_sticky=1',
+            '--prefix-field=is_pinned=0', check=True, stdout=out)
+        self.assertIn('Matching index: seek_idx', out.getvalue())
+        self.assertIn(
+            'ordered by is_sticky, is_pinned, -date, -id', out.getvalue())
+        self.assertRaises(
+            CommandError, call_command, seek_index_advisor.Command(),
+            'tests.Article', '--lookup-field=-date', check=True,
+            stdout=io.StringIO())
+        for prefix_field in ('is_pinned', 'foo=1', 'is_pinned=x'):
+            self.assertRaises(
+                CommandError, call_command, seek_index_advisor.Command(),
+                'tests.Article', '--lookup-field=-date',
+                '--prefix-field=%s' % prefix_field, stdout=io.StringIO())
@@ -0,0 +1,96 @@
+#-*- coding: utf-8 -*-
+
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Article
+from infinite_scroll_pagination.paginator import SeekPaginator
+from infinite_scroll_pagination import batch
+
+
+class RunBatchesTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds)
+
+    def test_update(self):
+        paginator = SeekPaginator(
+            Article.objects.filter(is_pinned=False),
+            per_page=10, lookup_field='-date')
+        keys = []
+        throttled = []
+        total = batch.run_batches(
+            paginator, {'is_sticky': True}, batch_size=7,
+            checkpoint=keys.append, throttle=throttled.append)
+        self.assertEqual(total, 25)
+        self.assertEqual(throttled, [7, 7, 7])
+        self.assertEqual(len(keys), 4)
+        self.assertFalse(Article.objects.filter(is_sticky=False).exists())
+        last = Article.objects.order_by('date', 'pk').first()
+        self.assertEqual(keys[-1], {'value': (last.date,), 'pk': last.pk})
+
+    def test_delete(self):
+        Article.objects.filter(
+            pk__in=Article.objects.order_by('pk').values('pk')[:5]
+        ).update(is_pinned=True)
+        paginator = SeekPaginator(
+            Article.objects.filter(is_pinned=False),
+            per_page=10, lookup_field='date_unique')
+        self.assertEqual(
+            batch.run_batches(paginator, batch.DELETE, batch_size=10), 20)
+        self.assertEqual(Article.objects.count(), 5)
+        self.assertEqual(Article.objects.filter(is_pinned=True).count(), 5)
+
+    def test_distinct(self):
+        paginator = SeekPaginator(
+            Article.objects.filter(is_pinned=False).distinct(),
+            per_page=10, lookup_field='-date_unique')
+        self.assertEqual(
+            batch.run_batches(paginator, batch.DELETE, batch_size=10), 25)
+        self.assertFalse(Article.objects.exists())
+
+    def test_values(self):
+        paginator = SeekPaginator(
+            Article.objects.values('title'),
+            per_page=10, lookup_field='-date_unique')
+        self.assertEqual(
+            batch.run_batches(paginator, {'is_sticky': True}), 25)
+        self.assertFalse(Article.objects.filter(is_sticky=False).exists())
+        paginator = SeekPaginator(
+            Article.objects.values_list('title', named=True),
+            per_page=10, lookup_field='-date_unique')
+        self.assertEqual(
+            batch.run_batches(paginator, batch.DELETE, batch_size=7), 25)
+        self.assertFalse(Article.objects.exists())
+
+    def test_resume(self):
+        articles = list(Article.objects.order_by('-date_unique', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field='-date_unique')
+        keys = []
+        batches = []
+
+        def action(query_set):
+            if len(batches) == 2:
+                raise ValueError('crash')
+            batches.append(list(query_set.order_by('-date_unique')))
+            query_set.update(title='done')
+
+        with self.assertRaises(ValueError):
+            batch.run_batches(
+                paginator, action, batch_size=5, checkpoint=keys.append)
+        self.assertEqual(len(keys), 2)
+        self.assertListEqual(
+            [a.pk for a in batches[0] + batches[1]],
+            [a.pk for a in articles[:10]])
+        self.assertEqual(Article.objects.filter(title='done').count(), 10)
+        total = batch.run_batches(
+            paginator, {'title': 'done'}, batch_size=5, **keys[-1])
+        self.assertEqual(total, 15)
+        self.assertEqual(Article.objects.filter(title='done').count(), 25)
@@ -0,0 +1,79 @@
+#-*- coding: utf-8 -*-
+
+import datetime
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Article
+from infinite_scroll_pagination.paginator import SeekPaginator
+from infinite_scroll_pagination.bookmarks import BookmarkIndex
+
+
+class BookmarkIndexTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.date = timezone.now()
+        for i in range(25):
+            Article.objects.create(
+                title="%s" % i, date=self.date + datetime.timedelta(
+                    seconds=i // 2),
+                date_unique=self.date + datetime.timedelta(seconds=i))
+        self.paginator = SeekPaginator(
+            Article.objects.all(), per_page=3, lookup_field='-date')
+        self.index = BookmarkIndex(self.paginator, interval=4)
+
+    def articles(self):
+        return list(Article.objects.order_by('-date', '-pk'))
+
+    def test_page(self):
+        articles = self.articles()
+        with self.assertNumQueries(2):
+            page = self.index.page(1)
+        self.assertListEqual(list(page), articles[:3])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertEqual(len(self.index.cache.get(
+            self.index._key())['bookmarks']), 6)
+        for number in range(2, 10):
+            with self.assertNumQueries(1):
+                page = self.index.page(number)
+            self.assertListEqual(
+                list(page), articles[(number - 1) * 3:number * 3])
+            self.assertTrue(page.has_previous())
+        self.assertFalse(page.has_next())
+        self.assertEqual(self.index.count(), 25)
+        self.assertEqual(self.index.num_pages(), 9)
+        self.assertRaises(EmptyPage, self.index.page, 10)
+        self.assertListEqual(
+            list(self.paginator.page(**page.prev_page(), move_to=2)),
+            articles[21:24])
+
+    def test_refresh(self):
+        self.index.build()
+        article = Article.objects.create(
+            title="new", date=self.date + datetime.timedelta(seconds=5),
+            date_unique=self.date + datetime.timedelta(days=1))
+        with self.assertNumQueries(1):
+            self.index.refresh(value=article.date, pk=article.pk)
+        articles = self.articles()
+        self.assertEqual(self.index.count(), 26)
+        for number in range(1, 10):
+            self.assertListEqual(
+                list(self.index.page(number)),
+                articles[(number - 1) * 3:number * 3])
+        article = articles[0]
+        article.delete()
+        self.index.refresh(value=article.date, pk=article.pk)
+        self.assertEqual(self.index.count(), 25)
+        self.assertListEqual(list(self.index.page(1)), articles[1:4])
+
+    def test_empty(self):
+        index = BookmarkIndex(SeekPaginator(
+            Article.objects.none(), per_page=3, lookup_field='-date'))
+        self.assertListEqual(list(index.page(1)), [])
+        self.assertEqual(index.num_pages(), 1)
+        self.assertRaises(EmptyPage, index.page, 2)
@@ -0,0 +1,211 @@
+#-*- coding: utf-8 -*-
+
+import datetime
+import gc
+import threading
+import weakref
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .models import Article
+from infinite_scroll_pagination.paginator import SeekPaginator, PREV_PAGE
+from infinite_scroll_pagination.cache import PageCache, ReadAhead
+
+
+class PageCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds)
+        self.page_cache = PageCache()
+        self.paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', page_cache=self.page_cache)
+
+    def test_hit(self):
+        page = self.paginator.page(value=None)
+        articles = list(Article.objects.order_by('-date_unique')[:10])
+        self.assertEqual(list(page), articles)
+        self.assertEqual(self.page_cache.misses, 1)
+        with self.assertNumQueries(1):
+            page = self.paginator.page(value=None)
+            self.assertEqual(list(page), articles)
+            self.assertTrue(page.has_next())
+            self.assertFalse(page.has_previous())
+        self.assertEqual(self.page_cache.hits, 1)
+        self.assertEqual(
+            page.next_page(), {'value': (articles[-1].date_unique,)})
+
+    def test_keys(self):
+        page = self.paginator.page(value=None)
+        value = page.next_page()['value']
+        page_next = self.paginator.page(value=value)
+        page_prev = self.paginator.page(value=value, move_to=PREV_PAGE)
+        self.assertEqual(self.page_cache.misses, 3)
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                list(self.paginator.page(value=value)), list(page_next))
+            self.assertEqual(
+                list(self.paginator.page(value=value, move_to=PREV_PAGE)),
+                list(page_prev))
+        self.assertEqual(self.page_cache.hits, 2)
+        paginator = SeekPaginator(
+            Article.objects.filter(is_pinned=False), per_page=10,
+            lookup_field='-date_unique', page_cache=self.page_cache)
+        paginator.page(value=None)
+        self.assertEqual(self.page_cache.misses, 4)
+
+    def test_values(self):
+        paginator = SeekPaginator(
+            Article.objects.values_list('title', named=True), per_page=10,
+            lookup_field='-date_unique', page_cache=self.page_cache)
+        page = paginator.page(value=None)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                list(paginator.page(value=None)), list(page))
+        self.assertEqual(self.page_cache.hits, 1)
+        self.assertEqual(
+            paginator.page(value=None).next_page(), page.next_page())
+
+    def test_invalidate_on_save(self):
+        self.paginator.page(value=None)
+        Article.objects.create(
+            title="new", date=timezone.now(),
+            date_unique=timezone.now() + datetime.timedelta(days=1))
+        page = self.paginator.page(value=None)
+        self.assertEqual(self.page_cache.hits, 0)
+        self.assertEqual(page[0].title, "new")
+
+    def test_invalidate_on_delete(self):
+        page = self.paginator.page(value=None)
+        page[0].delete()
+        page = self.paginator.page(value=None)
+        self.assertEqual(self.page_cache.hits, 0)
+        self.assertEqual(len(page), 10)
+
+    def test_missing_rows(self):
+        page = self.paginator.page(value=None)
+        # Does not send the post_delete signal
+        Article.objects.filter(pk=page[0].pk)._raw_delete('default')
+        page = self.paginator.page(value=None)
+        self.assertEqual(self.page_cache.hits, 0)
+        self.assertEqual(self.page_cache.misses, 2)
+        self.assertEqual(len(page), 10)
+
+    def create(self, title='new'):
+        return Article.objects.create(
+            title=title, date=timezone.now(),
+            date_unique=timezone.now() + datetime.timedelta(days=1))
+
+    def test_watch_on_init(self):
+        page_cache = PageCache(models=[Article])
+        generation = page_cache._generation(Article)
+        self.create()
+        self.assertNotEqual(page_cache._generation(Article), generation)
+        page_cache = PageCache(key_prefix='other')
+        SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', page_cache=page_cache)
+        generation = page_cache._generation(Article)
+        Article.objects.get(title='new').delete()
+        self.assertNotEqual(page_cache._generation(Article), generation)
+
+    def test_change_while_fetching(self):
+        page = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique').page(value=None)
+        fetch = page._fetch
+
+        def fetch_and_create(limit):
+            rows = fetch(limit)
+            self.create()
+            return rows
+
+        page._fetch = fetch_and_create
+        self.page_cache.set(page)
+        self.assertIsNone(self.page_cache.get(
+            self.paginator, value=None, pk=page._key['pk'],
+            move_to=page._move_to))
+
+    def test_evicted_generation(self):
+        self.paginator.page(value=None)
+        self.create()
+        cache.delete(self.page_cache._generation_key(Article))
+        page = self.paginator.page(value=None)
+        self.assertEqual(self.page_cache.hits, 0)
+        self.assertEqual(page[0].title, "new")
+
+    def test_collected(self):
+        page_cache = PageCache(models=[Article])
+        ref = weakref.ref(page_cache)
+        del page_cache
+        gc.collect()
+        self.assertIsNone(ref())
+        self.create()
+
+
+class ReadAheadTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds)
+        self.page_cache = PageCache()
+        self.read_ahead = ReadAhead(max_workers=1, max_pending=1)
+        self.addCleanup(self.read_ahead.shutdown)
+        self.paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', page_cache=self.page_cache,
+            read_ahead=self.read_ahead)
+
+    def test_read_ahead(self):
+        articles = list(Article.objects.order_by('-date_unique'))
+        page = self.paginator.page(value=None)
+        self.read_ahead.wait()
+        self.assertEqual(self.read_ahead.info().completed, 1)
+        with self.assertNumQueries(1):
+            page = self.paginator.page(**page.next_page())
+            self.assertEqual(list(page), articles[10:20])
+            self.assertTrue(page.has_next())
+        self.assertEqual(self.page_cache.read_ahead_hits, 1)
+        self.read_ahead.wait()
+        page = self.paginator.page(**page.next_page())
+        self.assertEqual(list(page), articles[20:])
+        self.assertEqual(self.page_cache.read_ahead_hits, 2)
+        self.assertEqual(self.read_ahead.info().submitted, 2)
+
+    def test_no_next_page(self):
+        page = self.paginator.page(value=None)
+        self.read_ahead.wait()
+        page = self.paginator.page(**page.next_page())
+        self.read_ahead.wait()
+        page = self.paginator.page(**page.next_page())
+        self.assertFalse(self.read_ahead.submit(page))
+        self.assertEqual(self.read_ahead.info().submitted, 2)
+
+    def test_dropped(self):
+        self.paginator.read_ahead = None
+        page_a = self.paginator.page(value=None)
+        page_b = self.paginator.page(**page_a.next_page())
+        # Keep the single worker busy
+        busy = threading.Event()
+        self.read_ahead._executor.submit(busy.wait)
+        self.assertTrue(self.read_ahead.submit(page_a))
+        self.assertFalse(self.read_ahead.submit(page_a))
+        self.assertFalse(self.read_ahead.submit(page_b))
+        busy.set()
+        self.read_ahead.wait()
+        info = self.read_ahead.info()
+        self.assertEqual(info.submitted, 1)
+        self.assertEqual(info.dropped, 1)
+        self.assertEqual(info.completed, 1)
+        self.assertEqual(info.pending, 0)
@@ -0,0 +1,123 @@
+#-*- coding: utf-8 -*-
+
+import datetime
+import warnings
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Article
+from infinite_scroll_pagination.paginator import SeekPaginator
+from infinite_scroll_pagination import paginator as inf_paginator
+from infinite_scroll_pagination.diagnostics import (
+    PlanInspector, SeekPlanWarning, classify)
+
+
+class PlanInspectorTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds)
+
+    def test_index_scan(self):
+        inspector = PlanInspector()
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', plan_inspector=inspector)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', SeekPlanWarning)
+            page = paginator.page(value=None)
+            list(page)
+            list(paginator.page(**page.next_page()))
+        self.assertEqual(
+            {info.shape for info in inspector.plans.values()},
+            {'first:-date_unique', 'seek:-date_unique'})
+        info, = inspector.plans_by_shape('seek:-date_unique')
+        self.assertFalse(info.full_scan)
+        self.assertFalse(info.sort)
+        self.assertIn('date_unique', info.sql)
+
+    def test_full_scan(self):
+        inspector = PlanInspector()
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-date'), plan_inspector=inspector)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            page = paginator.page(value=None, pk=None)
+            list(page)
+            list(paginator.page(value=None, pk=None))
+            list(paginator.page(**page.next_page()))
+        self.assertEqual(len(w), 2)
+        self.assertTrue(all(
+            issubclass(warning.category, SeekPlanWarning) for warning in w))
+        info, = inspector.plans_by_shape('seek:-is_pinned,-date,-pk')
+        self.assertTrue(info.full_scan)
+        self.assertTrue(info.sort)
+
+    def test_no_warn(self):
+        inspector = PlanInspector(warn=False)
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-date'), plan_inspector=inspector)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', SeekPlanWarning)
+            list(paginator.page(value=None, pk=None))
+        info, = inspector.plans_by_shape('first:-is_pinned,-date,-pk')
+        self.assertTrue(info.sort)
+
+    def test_shared(self):
+        inspector = PlanInspector(warn=False)
+        for query_set, filter_strategy in (
+                (Article.objects.all(), inf_paginator.Q_FILTER),
+                (Article.objects.filter(is_pinned=True),
+                 inf_paginator.Q_FILTER),
+                (Article.objects.all(), inf_paginator.ROW_VALUES_FILTER)):
+            paginator = SeekPaginator(
+                query_set, per_page=10, lookup_field='-date_unique',
+                filter_strategy=filter_strategy, plan_inspector=inspector)
+            list(paginator.page(value=None))
+        self.assertEqual(
+            len(inspector.plans_by_shape('first:-date_unique')), 3)
+        self.assertEqual(len(inspector.plans), 3)
+
+    def test_skip_scan(self):
+        inspector = PlanInspector(warn=False)
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-date_unique'),
+            filter_strategy=inf_paginator.SKIP_SCAN_FILTER,
+            plan_inspector=inspector)
+        list(paginator.page(value=None))
+        info, = inspector.plans_by_shape('first:-is_pinned,-date_unique')
+        # The first branch of the skip scan
+        self.assertIn(
+            'ORDER BY "tests_article"."date_unique" DESC', info.sql)
+        self.assertFalse(info.sort)
+
+    def test_classify(self):
+        self.assertEqual(
+            classify(
+                'Limit  (cost=0.42..1.02 rows=10 width=8)\n'
+                '  ->  Index Scan using article_date_idx on article'),
+            (False, False))
+        self.assertEqual(
+            classify(
+                'Limit  (cost=10.2..10.3 rows=10 width=8)\n'
+                '  ->  Sort  (cost=10.2..10.4 rows=100 width=8)\n'
+                '        Sort Key: date DESC, id DESC\n'
+                '        ->  Seq Scan on article'),
+            (True, True))
+        self.assertEqual(
+            classify(
+                '5 0 0 SEARCH tests_article USING INDEX '
+                'sqlite_autoindex_tests_article_1 (date_unique<?)'),
+            (False, False))
+        self.assertEqual(
+            classify(
+                '5 0 0 SCAN tests_article USING INDEX '
+                'sqlite_autoindex_tests_article_1'),
+            (False, False))
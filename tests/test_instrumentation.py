@@ -0,0 +1,96 @@
+#-*- coding: utf-8 -*-
+
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Article
+from infinite_scroll_pagination.paginator import SeekPaginator, EmptyPage
+from infinite_scroll_pagination.instrumentation import (
+    StatsCollector, Histogram)
+
+
+class InstrumentationTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds)
+        self.stats = []
+        self.paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date', instrument=self.stats.append)
+
+    def test_operations(self):
+        page = self.paginator.page(value=None, pk=None)
+        list(page)
+        page.has_next()
+        page.has_next()
+        page = self.paginator.page(**page.next_page())
+        page.metadata()
+        self.assertEqual(
+            [(s.operation, s.shape, s.depth, s.queries, s.rows)
+             for s in self.stats],
+            [('page', 'first:-date,-pk', 0, 0, 0),
+             ('object_list', 'first:-date,-pk', 0, 1, 10),
+             ('has_next', 'first:-date,-pk', 0, 1, 0),
+             ('has_next', 'first:-date,-pk', 0, 0, 0),
+             ('page', 'seek:-date,-pk', 2, 1, 0),
+             ('metadata', 'seek:-date,-pk', 2, 2, 0)])
+        for s in self.stats:
+            self.assertGreaterEqual(s.time, s.db_time)
+
+    def test_nested(self):
+        self.paginator.lazy = False
+        page = self.paginator.page(value=None, pk=None)
+        self.paginator.page(**page.next_page())
+        self.assertEqual(
+            [(s.operation, s.queries, s.rows) for s in self.stats],
+            [('page', 0, 0), ('object_list', 1, 10), ('page', 1, 10)])
+
+    def test_empty_page(self):
+        last = Article.objects.order_by('date', 'pk').first()
+        self.assertRaises(
+            EmptyPage, self.paginator.page, value=last.date, pk=last.pk)
+        self.assertEqual(
+            [(s.operation, s.queries) for s in self.stats], [('page', 1)])
+
+    def test_collector(self):
+        collector = StatsCollector()
+        self.paginator.instrument = collector
+        page = self.paginator.page(value=None, pk=None)
+        list(page)
+        page = self.paginator.page(value=None, pk=None)
+        list(page)
+        snapshot = collector.snapshot()
+        self.assertEqual(
+            set(snapshot),
+            {('page', 'first:-date,-pk'),
+             ('object_list', 'first:-date,-pk')})
+        rows = snapshot[('object_list', 'first:-date,-pk')]['rows']
+        self.assertEqual(rows['count'], 2)
+        self.assertEqual(rows['sum'], 20)
+        self.assertEqual(dict(rows['buckets'])[10], 2)
+        self.assertEqual(dict(rows['buckets'])[5], 0)
+        text = collector.prometheus()
+        self.assertIn(
+            'seek_paginator_queries_count'
+            '{operation="object_list",shape="first:-date,-pk"} 2', text)
+        self.assertIn(
+            'seek_paginator_rows_bucket'
+            '{operation="object_list",shape="first:-date,-pk",le="+Inf"} 2',
+            text)
+        collector.reset()
+        self.assertEqual(collector.snapshot(), {})
+
+    def test_histogram(self):
+        histogram = Histogram((1, 5))
+        for value in (0, 1, 2, 5, 6):
+            histogram.observe(value)
+        self.assertEqual(
+            histogram.cumulative(), [(1, 2), (5, 4), ('+Inf', 5)])
+        self.assertEqual(histogram.sum, 14)
+        self.assertEqual(histogram.count, 5)
@@ -1,7 +1,9 @@
 #-*- coding: utf-8 -*-
 
 import datetime
+from unittest import mock
 
+from django.db import connection
 from django.test import TestCase
 from django.utils import timezone
 
@@ -836,3 +838,254 @@ class Paginator3FieldsTest(TestCase):
             pk=page_2[0].pk,
             move_to=inf_paginator.PREV_PAGE)
         self.assertListEqual(list(page_1), list(articles[:10]))
+
+
+class PaginatorRowValuesTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds,
+                is_pinned=i % 3 == 0, is_sticky=i % 4 == 0)
+
+    def test_next_desc_non_unique(self):
+        articles = list(Article.objects.all().order_by(
+            '-is_pinned', '-is_sticky', "-date", '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(),
+            per_page=10,
+            lookup_field=('-is_pinned', '-is_sticky', '-date'),
+            filter_strategy=inf_paginator.ROW_VALUES_FILTER)
+        page_1 = paginator.page(value=None, pk=None)
+        self.assertListEqual(list(page_1), articles[:10])
+        page_2 = paginator.page(**page_1.next_page())
+        self.assertListEqual(list(page_2), articles[10:20])
+        page_3 = paginator.page(**page_2.next_page())
+        self.assertListEqual(list(page_3), articles[20:])
+        self.assertIn(
+            '"tests_article"."id") < (',
+            str(paginator.seek(move_to=inf_paginator.NEXT_PAGE, **page_1.next_page()).query))
+
+    def test_prev_asc_non_unique(self):
+        articles = list(Article.objects.all().order_by(
+            'is_pinned', 'is_sticky', "date", 'pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(),
+            per_page=10,
+            lookup_field=('is_pinned', 'is_sticky', 'date'),
+            filter_strategy=inf_paginator.ROW_VALUES_FILTER)
+        page_2 = paginator.page(
+            value=(
+                articles[20].is_pinned,
+                articles[20].is_sticky,
+                articles[20].date),
+            pk=articles[20].pk,
+            move_to=inf_paginator.PREV_PAGE)
+        self.assertListEqual(list(page_2), articles[10:20])
+        self.assertTrue(page_2.has_next())
+        self.assertEqual(page_2.prev_objects_left(), 10)
+        page_1 = paginator.page(
+            move_to=inf_paginator.PREV_PAGE, **page_2.prev_page())
+        self.assertListEqual(list(page_1), articles[:10])
+        self.assertFalse(page_1.has_previous())
+
+    def test_mixed_order_fallback(self):
+        articles = list(Article.objects.all().order_by(
+            '-is_pinned', 'is_sticky', "-date", '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(),
+            per_page=10,
+            lookup_field=('-is_pinned', 'is_sticky', '-date'),
+            filter_strategy=inf_paginator.ROW_VALUES_FILTER)
+        page_1 = paginator.page(value=None, pk=None)
+        self.assertListEqual(list(page_1), articles[:10])
+        page_2 = paginator.page(**page_1.next_page())
+        self.assertListEqual(list(page_2), articles[10:20])
+        self.assertNotIn(
+            ') < (',
+            str(paginator.seek(move_to=inf_paginator.NEXT_PAGE, **page_1.next_page()).query))
+
+
+class PaginatorSkipScanTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date + seconds // 2,
+                date_unique=date + seconds,
+                is_pinned=i % 3 == 0, is_sticky=i % 4 == 0)
+
+    def walk(self, lookup_field, per_page):
+        paginator = SeekPaginator(
+            Article.objects.all(),
+            per_page=per_page,
+            lookup_field=lookup_field,
+            filter_strategy=inf_paginator.SKIP_SCAN_FILTER)
+        pages = [paginator.page(value=None, pk=None)]
+        while pages[-1].has_next():
+            pages.append(paginator.page(**pages[-1].next_page()))
+        prev_pages = [pages[-1]]
+        while prev_pages[-1].has_previous():
+            prev_pages.append(paginator.page(
+                move_to=inf_paginator.PREV_PAGE,
+                **prev_pages[-1].prev_page()))
+        return pages, prev_pages
+
+    def test_pages(self):
+        for lookup_field in (
+                ('-is_pinned', '-is_sticky', '-date'),
+                ('is_pinned', '-is_sticky', 'date'),
+                ('-is_pinned', 'date')):
+            order = [f for f in lookup_field] + [
+                '-pk' if lookup_field[-1].startswith('-') else 'pk']
+            articles = list(Article.objects.order_by(*order))
+            for per_page in (1, 4, 10):
+                pages, prev_pages = self.walk(lookup_field, per_page)
+                self.assertListEqual(
+                    [a for page in pages for a in page], articles)
+                self.assertListEqual(
+                    [a for page in reversed(prev_pages) for a in page],
+                    articles)
+
+    def test_prefix(self):
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-is_sticky', '-date'),
+            filter_strategy=inf_paginator.SKIP_SCAN_FILTER)
+        self.assertEqual(
+            paginator._skip_scan_prefix(),
+            [('is_pinned', [True, False]), ('is_sticky', [True, False])])
+        paginator.lookup_fields = ('is_pinned', '-date_unique', 'is_sticky')
+        self.assertEqual(
+            paginator._skip_scan_prefix(), [('is_pinned', [False, True])])
+        paginator.lookup_fields = ('-date', 'is_pinned')
+        self.assertFalse(paginator._can_skip_scan())
+
+    def test_prefix_choices(self):
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('title', '-date'),
+            filter_strategy=inf_paginator.SKIP_SCAN_FILTER)
+        field = Article._meta.get_field('title')
+        # The collation may order 'B' after 'a'
+        with mock.patch.object(field, 'choices', [('B', 'B'), ('a', 'a')]):
+            self.assertFalse(paginator._can_skip_scan())
+        field = Article._meta.get_field('date_unique')
+        now = timezone.now()
+        later = now + datetime.timedelta(days=1)
+        paginator.lookup_fields = ('-date_unique', '-date')
+        with mock.patch.object(field, 'choices', [(later, ''), (now, '')]):
+            self.assertEqual(
+                paginator._skip_scan_prefix(),
+                [('date_unique', [later, now])])
+
+    def test_union(self):
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=3,
+            lookup_field=('-is_pinned', '-date'),
+            filter_strategy=inf_paginator.SKIP_SCAN_FILTER)
+        article = Article.objects.filter(is_pinned=True).first()
+        # SQLite does not support it, compile the query only
+        with mock.patch.object(
+                connection.features,
+                'supports_slicing_ordering_in_compound', True):
+            query_sets = paginator._skip_scan_query_sets(
+                value=(True, article.date), pk=article.pk,
+                move_to=inf_paginator.NEXT_PAGE, limit=4)
+            self.assertEqual(len(query_sets), 1)
+            sql = str(query_sets[0].query)
+        self.assertEqual(sql.count('UNION ALL'), 1)
+        first, second = sql.split(' UNION ALL ')
+        # One range scan per is_pinned value, each with its own limit
+        self.assertIn('WHERE ("tests_article"."is_pinned" AND (', first)
+        self.assertIn(
+            'ORDER BY "tests_article"."date" DESC, '
+            '"tests_article"."id" DESC LIMIT 4)', first)
+        self.assertIn('WHERE NOT "tests_article"."is_pinned" ORDER BY', second)
+        self.assertTrue(second.endswith(
+            'LIMIT 4) ORDER BY "col5" DESC, "col3" DESC, "col1" DESC LIMIT 4'))
+
+    def test_branches(self):
+        articles = list(Article.objects.order_by(
+            '-is_pinned', '-date', '-pk'))
+        pinned = [a for a in articles if a.is_pinned]
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=3,
+            lookup_field=('-is_pinned', '-date'),
+            filter_strategy=inf_paginator.SKIP_SCAN_FILTER)
+        # The last pinned page fetches a second branch
+        page = paginator.page(
+            value=(True, pinned[-3].date), pk=pinned[-3].pk)
+        with self.assertNumQueries(2):
+            self.assertListEqual(
+                list(page), pinned[-2:] + articles[len(pinned):][:1])
+        page = paginator.page(value=(True, pinned[2].date), pk=pinned[2].pk)
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), pinned[3:6])
+
+
+class PaginatorPrefixFieldsTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date + seconds // 2,
+                date_unique=date + seconds, is_pinned=i % 3 == 0)
+
+    def test_pages(self):
+        articles = list(Article.objects.filter(
+            is_pinned=False).order_by('-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=5, lookup_field='-date',
+            prefix_fields={'is_pinned': False})
+        page = paginator.page(value=None, pk=None)
+        pages = [page]
+        while page.has_next():
+            page = paginator.page(**page.next_page())
+            pages.append(page)
+        self.assertListEqual([a for p in pages for a in p], articles)
+        self.assertEqual(
+            pages[0].next_page(),
+            {'value': (articles[4].date,), 'pk': articles[4].pk})
+        page = paginator.page(
+            move_to=inf_paginator.PREV_PAGE, **pages[-1].prev_page())
+        self.assertListEqual(list(page), list(pages[-2]))
+        self.assertEqual(
+            paginator.prepare_order(
+                has_pk=True, move_to=inf_paginator.NEXT_PAGE),
+            ['is_pinned', '-date', '-pk'])
+        sql = str(paginator.seek(
+            move_to=inf_paginator.NEXT_PAGE, **pages[0].next_page()).query)
+        self.assertIn('NOT "tests_article"."is_pinned"', sql)
+        self.assertNotIn('"tests_article"."is_pinned" <', sql)
+        self.assertIn(
+            'ORDER BY "tests_article"."is_pinned" ASC, '
+            '"tests_article"."date" DESC', sql)
+
+    def test_lookup_field(self):
+        self.assertRaises(
+            AssertionError, SeekPaginator, Article.objects.all(),
+            per_page=5, lookup_field='-date', prefix_fields={'date': 1})
+
+    def test_advisor(self):
+        from django.db import connection
+        from infinite_scroll_pagination.advisor import advise
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX "seek_idx" ON "tests_article" '
+                '("is_pinned", "date" DESC, "id" DESC)')
+        advice = advise(SeekPaginator(
+            Article.objects.all(), per_page=5, lookup_field='-date',
+            prefix_fields={'is_pinned': False}))
+        self.assertEqual(advice.index_name, 'seek_idx')
+        self.assertEqual(advice.fields, ['is_pinned', '-date', '-id'])
+        advice = advise(SeekPaginator(
+            Article.objects.all(), per_page=5,
+            lookup_field=('-is_pinned', '-date')))
+        self.assertIsNone(advice.index_name)
@@ -2,11 +2,16 @@
 
 from __future__ import unicode_literals
 import datetime
+import decimal
 import json
+import uuid
 
 import pytz
+from asgiref.sync import async_to_sync, sync_to_async
 
-from django.test import TestCase, override_settings
+from django.db.models import (
+    DecimalField, DurationField, ExpressionWrapper, Value)
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -252,6 +257,121 @@ class PageTest(TestCase):
             **page.prev_page())
         self.assertFalse(page.has_previous())
 
+    def test_has_next_page_lookahead(self):
+        articles = list(Article.objects.all().order_by("date_unique"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field="date_unique", lookahead=True)
+        page = paginator.page(value=None)
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), list(articles[:10]))
+            self.assertTrue(page.has_next())
+        page = paginator.page(**page.next_page())
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), list(articles[10:20]))
+            self.assertTrue(page.has_next())
+        page = paginator.page(**page.next_page())
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), list(articles[20:]))
+            self.assertFalse(page.has_next())
+
+    def test_has_prev_page_lookahead(self):
+        articles = list(Article.objects.all().order_by("-date_unique"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field="-date_unique", lookahead=True)
+        page = paginator.page(
+            value=articles[20].date_unique,
+            move_to=inf_paginator.PREV_PAGE)
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), list(articles[10:20]))
+            self.assertTrue(page.has_previous())
+        page = paginator.page(
+            move_to=inf_paginator.PREV_PAGE,
+            **page.prev_page())
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), list(articles[:10]))
+            self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_not_lazy(self):
+        articles = list(Article.objects.all().order_by("-date_unique"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field="-date_unique", lazy=False)
+        with self.assertNumQueries(1):
+            page = paginator.page(value=articles[9].date_unique)
+            self.assertListEqual(list(page), articles[10:20])
+        with self.assertNumQueries(1):
+            with self.assertRaises(inf_paginator.EmptyPage):
+                paginator.page(value=articles[-1].date_unique)
+        with self.assertNumQueries(1):
+            page = paginator.page(value=None)
+            self.assertListEqual(list(page), articles[:10])
+
+    def test_lazy(self):
+        articles = list(Article.objects.all().order_by("-date_unique"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field="-date_unique")
+        with self.assertNumQueries(1):
+            page = paginator.page(value=articles[9].date_unique)
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(page), articles[10:20])
+        with self.assertRaises(inf_paginator.EmptyPage):
+            paginator.page(value=articles[-1].date_unique)
+
+    def test_metadata(self):
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field="-date_unique")
+        page = paginator.page(value=None)
+        page = paginator.page(**page.next_page())
+        list(page)
+        for limit in (None, 1, 2, 15, 100):
+            with self.assertNumQueries(1):
+                metadata = page.metadata(limit=limit)
+            with self.assertNumQueries(0):
+                self.assertIs(page.metadata(limit=limit), metadata)
+            self.assertEqual(metadata, {
+                'has_next': page.has_next(),
+                'has_previous': page.has_previous(),
+                'next_objects_left': page.next_objects_left(limit),
+                'prev_objects_left': page.prev_objects_left(limit),
+                'next_pages_left': page.next_pages_left(limit),
+                'prev_pages_left': page.prev_pages_left(limit)})
+        self.assertEqual(page.metadata(), {
+            'has_next': True,
+            'has_previous': True,
+            'next_objects_left': 5,
+            'prev_objects_left': 10,
+            'next_pages_left': 1,
+            'prev_pages_left': 1})
+        with self.assertNumQueries(0):
+            self.assertTrue(page.has_next())
+
+    def test_estimate(self):
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field="-date_unique")
+        page = paginator.page(value=None)
+        page = paginator.page(**page.next_page())
+        list(page)
+        with self.assertNumQueries(1):
+            estimate = page.next_objects_estimate(threshold=5)
+        self.assertEqual(estimate, (5, True, 5))
+        self.assertEqual(str(estimate), '5')
+        # The planner estimate is only available on PostgreSQL
+        estimate = page.next_objects_estimate(threshold=4)
+        self.assertEqual(estimate, (5, False, 4))
+        self.assertEqual(str(estimate), '4+')
+        self.assertEqual(page.prev_objects_estimate(), (10, True, 1000))
+        self.assertEqual(page.next_pages_estimate(), (1, True, 100))
+        estimate = page.prev_pages_estimate(threshold=0)
+        self.assertEqual(estimate, (1, False, 0))
+        self.assertEqual(str(estimate), '0+')
+        page = SeekPaginator(
+            Article.objects.none(), per_page=10,
+            lookup_field="-date_unique").page(value=None)
+        self.assertEqual(page.next_pages_estimate(), (0, True, 100))
+
     def test_empty_first_page(self):
         paginator = SeekPaginator(
             Article.objects.none(), per_page=10, lookup_field="-date_unique")
@@ -264,6 +384,607 @@ class PageTest(TestCase):
         self.assertEqual(page.next_pages_left(), 0)
         self.assertEqual(page.next_page(), {})
         self.assertEqual(page.prev_page(), {})
+        self.assertEqual(page.metadata(limit=10), {
+            'has_next': False,
+            'has_previous': False,
+            'next_objects_left': 0,
+            'prev_objects_left': 0,
+            'next_pages_left': 0,
+            'prev_pages_left': 0})
+
+
+class SQLCacheTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds,
+                is_pinned=i % 3 == 0)
+
+    def test_pages(self):
+        articles = list(Article.objects.all().order_by(
+            '-is_pinned', '-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-date'), sql_cache_size=10)
+        page = paginator.page(value=None, pk=None)
+        self.assertListEqual(list(page), articles[:10])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        page = paginator.page(**page.next_page())
+        self.assertListEqual(list(page), articles[10:20])
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+        page = paginator.page(**page.next_page())
+        self.assertListEqual(list(page), articles[20:])
+        self.assertFalse(page.has_next())
+        page = paginator.page(
+            move_to=inf_paginator.PREV_PAGE, **page.prev_page())
+        self.assertListEqual(list(page), articles[10:20])
+        self.assertEqual(
+            paginator.sql_cache_info(),
+            inf_paginator.SQLCacheInfo(
+                hits=7, misses=5, maxsize=10, currsize=5))
+        paginator.sql_cache_clear()
+        self.assertEqual(
+            paginator.sql_cache_info(),
+            inf_paginator.SQLCacheInfo(
+                hits=0, misses=0, maxsize=10, currsize=0))
+
+    def test_row_values(self):
+        articles = list(Article.objects.all().order_by(
+            '-is_pinned', '-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-date'), sql_cache_size=10,
+            filter_strategy=inf_paginator.ROW_VALUES_FILTER)
+        page = paginator.page(value=None, pk=None)
+        self.assertListEqual(list(page), articles[:10])
+        page = paginator.page(**page.next_page())
+        self.assertListEqual(list(page), articles[10:20])
+        page = paginator.page(**page.next_page())
+        self.assertListEqual(list(page), articles[20:])
+        self.assertEqual(paginator.sql_cache_info().hits, 2)
+
+    def test_lru(self):
+        articles = list(Article.objects.all().order_by('-date_unique'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', sql_cache_size=1, lazy=False)
+        page = paginator.page(value=articles[4].date_unique)
+        self.assertListEqual(list(page), articles[5:15])
+        page = paginator.page(
+            value=articles[20].date_unique,
+            move_to=inf_paginator.PREV_PAGE)
+        self.assertListEqual(list(page), articles[10:20])
+        page = paginator.page(value=articles[9].date_unique)
+        self.assertListEqual(list(page), articles[10:20])
+        self.assertEqual(
+            paginator.sql_cache_info(),
+            inf_paginator.SQLCacheInfo(
+                hits=0, misses=3, maxsize=1, currsize=1))
+
+    def test_not_cached(self):
+        paginator = SeekPaginator(
+            Article.objects.all().select_related(), per_page=10,
+            lookup_field='-date_unique', sql_cache_size=10)
+        page = paginator.page(value=None)
+        page = paginator.page(**page.next_page())
+        self.assertEqual(len(page), 10)
+        self.assertTrue(page.has_next())
+        self.assertEqual(
+            paginator.sql_cache_info(),
+            inf_paginator.SQLCacheInfo(
+                hits=0, misses=0, maxsize=10, currsize=0))
+
+    def test_empty_result(self):
+        for query_set in (
+                Article.objects.none(),
+                Article.objects.filter(pk__in=[])):
+            paginator = SeekPaginator(
+                query_set, per_page=10, lookup_field='-date_unique',
+                sql_cache_size=10)
+            page = paginator.page(value=None)
+            self.assertListEqual(list(page), [])
+            self.assertFalse(page.has_next())
+            self.assertRaises(
+                inf_paginator.EmptyPage, paginator.page,
+                value=timezone.now())
+
+    def test_annotations(self):
+        query_set = Article.objects.annotate(
+            delay=ExpressionWrapper(
+                Value(datetime.timedelta(seconds=1)),
+                output_field=DurationField()),
+            price=ExpressionWrapper(
+                Value(decimal.Decimal('1.5')),
+                output_field=DecimalField(max_digits=5, decimal_places=2)))
+        uncached = SeekPaginator(
+            query_set, per_page=10, lookup_field='-date_unique')
+        cached = SeekPaginator(
+            query_set, per_page=10, lookup_field='-date_unique',
+            sql_cache_size=10)
+        for paginator in (uncached, cached):
+            page = paginator.page(value=None)
+            page = paginator.page(**page.next_page())
+            self.assertEqual(
+                [(a.delay, a.price) for a in page],
+                [(datetime.timedelta(seconds=1), decimal.Decimal('1.5'))] * 10)
+        self.assertEqual(cached.sql_cache_info().currsize, 0)
+
+    def test_shared(self):
+        articles = list(Article.objects.all().order_by('-date_unique'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', shared_sql_cache=True)
+        paginator.sql_cache_clear()
+        self.addCleanup(paginator.sql_cache_clear)
+        # A paginator per request, as in the views
+        for _ in range(3):
+            page = inf_paginator.paginate(
+                Article.objects.all(), per_page=10,
+                lookup_field='-date_unique',
+                value=articles[9].date_unique, shared_sql_cache=True)
+            self.assertListEqual(list(page), articles[10:20])
+        self.assertEqual(
+            paginator.sql_cache_info(),
+            inf_paginator.SQLCacheInfo(
+                hits=4, misses=2, maxsize=256, currsize=2))
+        # Another queryset or ordering is another fingerprint
+        page = inf_paginator.paginate(
+            Article.objects.filter(is_pinned=True), per_page=10,
+            lookup_field='-date_unique',
+            value=articles[9].date_unique, shared_sql_cache=True)
+        self.assertListEqual(
+            list(page), [a for a in articles[10:] if a.is_pinned])
+        page = inf_paginator.paginate(
+            Article.objects.all(), per_page=10,
+            lookup_field='date_unique',
+            value=articles[20].date_unique, shared_sql_cache=True)
+        self.assertListEqual(list(page), articles[10:20][::-1])
+        self.assertEqual(paginator.sql_cache_info().currsize, 6)
+
+    def test_shared_and_size(self):
+        self.assertRaises(
+            AssertionError, SeekPaginator,
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', sql_cache_size=10,
+            shared_sql_cache=True)
+
+
+class AsyncPageTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(title="%s" % i, date=date, date_unique=date + seconds)
+
+    async def test_apaginate(self):
+        articles = [a async for a in Article.objects.all().order_by("-date_unique")]
+        page = await inf_paginator.apaginate(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', value=None)
+        self.assertListEqual([a async for a in page], articles[:10])
+        self.assertTrue(await page.ahas_next())
+        self.assertFalse(await page.ahas_previous())
+        self.assertEqual(await page.anext_objects_left(), 15)
+        self.assertEqual(await page.anext_objects_left(limit=5), 5)
+        self.assertEqual(await page.aprev_objects_left(), 0)
+        self.assertEqual(await page.anext_pages_left(), 2)
+        self.assertEqual(await page.aprev_pages_left(), 0)
+        page = await inf_paginator.apaginate(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', **page.next_page())
+        self.assertListEqual(await page.aobject_list(), articles[10:20])
+        await page.aobject_list()
+
+        def ametadata():
+            with self.assertNumQueries(1):
+                return async_to_sync(page.ametadata)(limit=100)
+
+        metadata = await sync_to_async(ametadata)()
+        self.assertEqual(metadata, {
+            'has_next': True,
+            'has_previous': True,
+            'next_objects_left': 5,
+            'prev_objects_left': 10,
+            'next_pages_left': 1,
+            'prev_pages_left': 1})
+
+    async def test_apage(self):
+        articles = [a async for a in Article.objects.all().order_by("-date_unique")]
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field="-date_unique", lookahead=True)
+        page = await paginator.apage(
+            value=articles[20].date_unique,
+            move_to=inf_paginator.PREV_PAGE)
+        self.assertListEqual(await page.aobject_list(), articles[10:20])
+        self.assertTrue(await page.ahas_previous())
+        self.assertTrue(await page.ahas_next())
+        with self.assertRaises(inf_paginator.EmptyPage):
+            await paginator.apage(value=articles[-1].date_unique)
+        paginator.lazy = False
+        with self.assertRaises(inf_paginator.EmptyPage):
+            await paginator.apage(value=articles[-1].date_unique)
+
+    async def test_empty_first_page(self):
+        page = await inf_paginator.apaginate(
+            Article.objects.none(), per_page=10,
+            lookup_field='-date_unique', value=None)
+        self.assertFalse(await page.aobject_list())
+        self.assertFalse(await page.ahas_next())
+        self.assertEqual(await page.anext_objects_left(), 0)
+        self.assertEqual((await page.ametadata())['next_pages_left'], 0)
+
+    async def test_apage_unsupported(self):
+        for options in (
+                {'instrument': print},
+                {'plan_inspector': object()},
+                {'filter_strategy': inf_paginator.SKIP_SCAN_FILTER}):
+            paginator = SeekPaginator(
+                Article.objects.all(), per_page=10,
+                lookup_field='-date_unique', **options)
+            with self.assertRaises(AssertionError):
+                await paginator.apage(value=None)
+
+    async def test_aobject_list_sql_cache(self):
+        articles = [
+            a async for a in Article.objects.all().order_by('-date_unique')]
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field='-date_unique', sql_cache_size=10)
+        page = await sync_to_async(paginator.page)(
+            value=articles[9].date_unique)
+        self.assertListEqual(await page.aobject_list(), articles[10:20])
+
+
+class IterateTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(title="%s" % i, date=date, date_unique=date + seconds)
+
+    def test_iterate(self):
+        articles = list(Article.objects.all().order_by("-date_unique"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field="-date_unique")
+        with self.assertNumQueries(3):
+            self.assertListEqual(list(paginator.iterate()), articles)
+        with self.assertNumQueries(6):
+            self.assertListEqual(
+                list(paginator.iterate(chunk_size=5)), articles)
+
+    def test_iterate_non_unique(self):
+        articles = list(Article.objects.all().order_by("-date", "-pk"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field="-date")
+        self.assertListEqual(
+            list(paginator.iterate(chunk_size=3, pk=None)), articles)
+        # The pk tiebreaker is the default
+        self.assertListEqual(
+            list(paginator.iterate(chunk_size=3)), articles)
+        self.assertListEqual(
+            [a for chunk in paginator.iterate(chunk_size=10, chunks=True)
+             for a in chunk],
+            articles)
+
+    def test_iterate_chunks_resume(self):
+        articles = list(Article.objects.all().order_by("-date", "-pk"))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field="-date")
+        chunks = paginator.iterate(chunk_size=7, chunks=True)
+        chunk = next(chunks)
+        self.assertListEqual(list(chunk), articles[:7])
+        cursor = chunk.next_page()
+        chunks.close()
+        chunks = list(paginator.iterate(chunk_size=7, chunks=True, **cursor))
+        self.assertEqual([len(c) for c in chunks], [7, 7, 4])
+        self.assertListEqual(
+            [a for c in chunks for a in c], articles[7:])
+
+    def test_iterate_empty(self):
+        paginator = SeekPaginator(
+            Article.objects.none(), per_page=10, lookup_field="-date_unique")
+        self.assertListEqual(list(paginator.iterate()), [])
+
+
+class KeyRangesTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds,
+                is_pinned=i % 3 == 0)
+
+    def test_key_ranges(self):
+        articles = list(Article.objects.all().order_by(
+            '-is_pinned', '-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-date'))
+        with self.assertNumQueries(4) as ctx:
+            key_ranges = paginator.key_ranges(4)
+        # Each probe seeks from the previous boundary
+        for query in ctx.captured_queries[1:]:
+            self.assertIn('LIMIT 1 OFFSET 6', query['sql'])
+        self.assertNotIn(' < ', ctx.captured_queries[1]['sql'])
+        self.assertIn(' < ', ctx.captured_queries[2]['sql'])
+        self.assertEqual(len(key_ranges), 4)
+        self.assertEqual(key_ranges[0].start, {'value': None, 'pk': None})
+        self.assertIsNone(key_ranges[-1].stop)
+        for a, b in zip(key_ranges, key_ranges[1:]):
+            self.assertEqual(a.stop, b.start)
+        scanned = [
+            list(paginator.iterate(chunk_size=3, stop=r.stop, **r.start))
+            for r in key_ranges]
+        self.assertEqual([len(rows) for rows in scanned], [7, 7, 7, 4])
+        self.assertListEqual(
+            [a for rows in scanned for a in rows], articles)
+
+    def test_key_ranges_few_rows(self):
+        pks = list(Article.objects.values_list('pk', flat=True)[:2])
+        paginator = SeekPaginator(
+            Article.objects.filter(pk__in=pks),
+            per_page=10, lookup_field='-date_unique')
+        key_ranges = paginator.key_ranges(5)
+        self.assertEqual(len(key_ranges), 2)
+        paginator = SeekPaginator(
+            Article.objects.none(), per_page=10, lookup_field='-date_unique')
+        self.assertEqual(
+            paginator.key_ranges(5),
+            [inf_paginator.KeyRange(
+                start={'value': None, 'pk': None}, stop=None)])
+
+
+class PagesTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds,
+                is_pinned=i % 3 == 0)
+
+    def test_pages(self):
+        pinned = list(Article.objects.filter(
+            is_pinned=True).order_by('-date_unique'))
+        not_pinned = list(Article.objects.filter(
+            is_pinned=False).order_by('-date_unique'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=5, lookup_field='-date_unique')
+        with self.assertNumQueries(1):
+            pages = paginator.pages('is_pinned', {True: None, False: None})
+            self.assertListEqual(list(pages[True]), pinned[:5])
+            self.assertListEqual(list(pages[False]), not_pinned[:5])
+            self.assertTrue(pages[True].has_next())
+            self.assertTrue(pages[False].has_next())
+        with self.assertNumQueries(1):
+            pages = paginator.pages('is_pinned', {
+                True: pages[True].next_page(),
+                False: pages[False].next_page()})
+            self.assertListEqual(list(pages[True]), pinned[5:])
+            self.assertListEqual(list(pages[False]), not_pinned[5:10])
+            self.assertFalse(pages[True].has_next())
+            self.assertTrue(pages[False].has_next())
+        self.assertTrue(pages[True].has_previous())
+        pages = paginator.pages(
+            'is_pinned', {True: pages[True].prev_page()},
+            move_to=inf_paginator.PREV_PAGE)
+        self.assertListEqual(list(pages[True]), pinned[:5])
+        self.assertFalse(pages[True].has_previous())
+        self.assertTrue(pages[True].has_next())
+
+    def test_pages_pk(self):
+        articles = list(Article.objects.filter(
+            is_pinned=False).order_by('-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=5, lookup_field='-date')
+        pages = paginator.pages('is_pinned', {False: {'pk': None}})
+        self.assertListEqual(list(pages[False]), articles[:5])
+        pages = paginator.pages('is_pinned', {
+            False: pages[False].next_page(), True: None})
+        self.assertListEqual(list(pages[False]), articles[5:10])
+        self.assertEqual(len(pages[True]), 5)
+
+    def test_pages_empty(self):
+        paginator = SeekPaginator(
+            Article.objects.filter(is_pinned=False),
+            per_page=5, lookup_field='-date_unique')
+        pages = paginator.pages('is_pinned', {True: None})
+        self.assertListEqual(list(pages[True]), [])
+        self.assertFalse(pages[True].has_next())
+        self.assertEqual(paginator.pages('is_pinned', {}), {})
+
+
+class DeferredJoinTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds)
+
+    def test_pages(self):
+        articles = list(Article.objects.all().order_by('-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.only('title', 'date'), per_page=10,
+            lookup_field='-date', deferred_join=True)
+        page = paginator.page(value=None, pk=None)
+        with self.assertNumQueries(2) as ctx:
+            self.assertListEqual(list(page), articles[:10])
+        self.assertNotIn('"title"', ctx.captured_queries[0]['sql'])
+        self.assertIn('"title"', ctx.captured_queries[1]['sql'])
+        self.assertEqual(page[0].get_deferred_fields(), {
+            'date_unique', 'is_pinned', 'is_sticky'})
+        page = paginator.page(**page.next_page())
+        self.assertListEqual(list(page), articles[10:20])
+        page = paginator.page(
+            move_to=inf_paginator.PREV_PAGE, **page.prev_page())
+        self.assertListEqual(list(page), articles[:10])
+        self.assertFalse(page.has_previous())
+
+    def test_empty(self):
+        paginator = SeekPaginator(
+            Article.objects.none(), per_page=10,
+            lookup_field='-date_unique', deferred_join=True)
+        page = paginator.page(value=None)
+        with self.assertNumQueries(0):
+            self.assertListEqual(list(page), [])
+
+    def test_sql_cache(self):
+        articles = list(Article.objects.all().order_by('-date_unique'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field='-date_unique',
+            sql_cache_size=16, deferred_join=True)
+        page = paginator.page(value=articles[9].date_unique)
+        with self.assertNumQueries(2):
+            self.assertListEqual(list(page), articles[10:20])
+
+    async def test_apaginate(self):
+        articles = [
+            a async for a in Article.objects.all().order_by('-date_unique')]
+        page = await inf_paginator.apaginate(
+            Article.objects.defer('title'), per_page=10,
+            lookup_field='-date_unique', value=None, deferred_join=True)
+        self.assertListEqual(await page.aobject_list(), articles[:10])
+        page = await inf_paginator.apaginate(
+            Article.objects.defer('title'), per_page=10,
+            lookup_field='-date_unique', deferred_join=True,
+            move_to=inf_paginator.PREV_PAGE,
+            value=articles[20].date_unique)
+        self.assertListEqual(await page.aobject_list(), articles[10:20])
+
+
+class ValuesTest(TestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(
+                title="%s" % i, date=date, date_unique=date + seconds,
+                is_pinned=i % 3 == 0)
+
+    def walk(self, paginator, **key):
+        page = paginator.page(**key)
+        pages = [page]
+        while page.has_next():
+            page = paginator.page(**page.next_page())
+            pages.append(page)
+        prev = paginator.page(
+            move_to=inf_paginator.PREV_PAGE, **pages[-1].prev_page())
+        self.assertListEqual(list(prev), list(pages[-2]))
+        return [row for page in pages for row in page]
+
+    def test_values(self):
+        articles = list(
+            Article.objects.order_by('-date_unique')
+            .values('title', 'date_unique', 'pk'))
+        paginator = SeekPaginator(
+            Article.objects.values('title'),
+            per_page=10, lookup_field='-date_unique')
+        self.assertListEqual(self.walk(paginator, value=None), articles)
+        page = paginator.page(value=None)
+        self.assertEqual(
+            page.next_page(), {'value': (articles[9]['date_unique'],)})
+
+    def test_values_pk(self):
+        articles = list(
+            Article.objects.order_by('-date', '-id').values('id', 'date'))
+        paginator = SeekPaginator(
+            Article.objects.values('id'), per_page=10, lookup_field='-date')
+        self.assertListEqual(
+            self.walk(paginator, value=None, pk=None), articles)
+        page = paginator.page(value=None, pk=None)
+        self.assertEqual(page.next_page(), {
+            'value': (articles[9]['date'],), 'pk': articles[9]['id']})
+
+    def test_values_list(self):
+        articles = list(
+            Article.objects.order_by('-date', '-pk')
+            .values_list('title', 'date', 'pk'))
+        paginator = SeekPaginator(
+            Article.objects.values_list('title'),
+            per_page=10, lookup_field='-date')
+        self.assertListEqual(
+            self.walk(paginator, value=None, pk=None), articles)
+
+    def test_values_list_named(self):
+        articles = list(
+            Article.objects.order_by('-date_unique')
+            .values_list('date_unique', 'title', 'pk', named=True))
+        paginator = SeekPaginator(
+            Article.objects.values_list('date_unique', 'title', named=True),
+            per_page=10, lookup_field='-date_unique')
+        rows = self.walk(paginator, value=None)
+        self.assertListEqual(rows, articles)
+        self.assertEqual(rows[0].title, articles[0].title)
+
+    def test_values_list_flat(self):
+        self.assertRaises(
+            AssertionError, SeekPaginator,
+            Article.objects.values_list('title', flat=True),
+            per_page=10, lookup_field='-date_unique')
+
+    def test_no_model_instances(self):
+        paginator = SeekPaginator(
+            Article.objects.values('title'),
+            per_page=10, lookup_field='-date_unique',
+            lookahead=True, deferred_join=True)
+        page = paginator.page(value=None)
+        self.assertTrue(all(isinstance(row, dict) for row in page))
+        self.assertTrue(page.has_next())
+        page = paginator.page(**page.next_page())
+        self.assertEqual(len(page), 10)
+
+    def test_pages(self):
+        pinned = list(
+            Article.objects.filter(is_pinned=True)
+            .order_by('-date_unique')
+            .values_list('title', 'date_unique', 'pk', named=True))
+        paginator = SeekPaginator(
+            Article.objects.values_list('title', named=True),
+            per_page=5, lookup_field='-date_unique')
+        pages = paginator.pages('is_pinned', {True: None, False: None})
+        self.assertListEqual(list(pages[True]), pinned[:5])
+        pages = paginator.pages('is_pinned', {True: pages[True].next_page()})
+        self.assertListEqual(list(pages[True]), pinned[5:])
+
+
+class ScanKeyRangesTest(TransactionTestCase):
+
+    def setUp(self):
+        date = timezone.now()
+
+        for i in range(25):
+            seconds = datetime.timedelta(seconds=i)
+            Article.objects.create(title="%s" % i, date=date, date_unique=date + seconds)
+
+    def test_scan_key_ranges(self):
+        articles = list(Article.objects.all().order_by('-date_unique', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10, lookup_field='-date_unique')
+        result = paginator.scan_key_ranges(
+            list, paginator.key_ranges(3), chunk_size=4, max_workers=3)
+        self.assertEqual([len(rows) for rows in result], [9, 9, 7])
+        self.assertListEqual([a for rows in result for a in rows], articles)
 
 
 class SerializerTest(TestCase):
@@ -347,6 +1068,91 @@ class SerializerTest(TestCase):
             (dt, '1'))
 
 
+class CursorTest(TestCase):
+
+    def test_to_cursor_from_cursor(self):
+        values = (
+            True, False, 0, -5, 2 ** 70, 1.5,
+            decimal.Decimal('1.10'), 'héllo',
+            datetime.date(2020, 1, 2),
+            datetime.datetime(2012, 3, 9, 22, 30, 40, 123123),
+            pytz.utc.localize(datetime.datetime(
+                1931, 3, 9, 22, 30, 40, 123123)),
+            uuid.UUID('c823c988-d759-4640-a5e7-7a036a3b6b70'))
+        for value in values:
+            cursor = serializers.to_cursor(value=(value,), pk=1)
+            self.assertRegex(cursor, r'^[A-Za-z0-9_-]+$')
+            self.assertEqual(
+                serializers.from_cursor(cursor),
+                {'value': (value,), 'pk': 1})
+            self.assertEqual(
+                type(serializers.from_cursor(cursor)['value'][0]),
+                type(value))
+        cursor = serializers.to_cursor(value=values, pk=values[-1])
+        self.assertEqual(
+            serializers.from_cursor(cursor),
+            {'value': values, 'pk': values[-1]})
+
+    def test_no_pk(self):
+        cursor = serializers.to_cursor(value=5)
+        self.assertEqual(serializers.from_cursor(cursor), {'value': (5,)})
+
+    def test_first_page(self):
+        self.assertEqual(serializers.to_cursor(value=None, pk=None), '')
+        self.assertEqual(
+            serializers.from_cursor(''), {'value': None, 'pk': None})
+
+    def test_compact(self):
+        dt = pytz.utc.localize(datetime.datetime(
+            year=2012, month=3, day=9, hour=22,
+            minute=30, second=40, microsecond=123123))
+        self.assertLessEqual(
+            len(serializers.to_cursor(value=(True, True, dt), pk=123456)),
+            len(serializers.to_page_key(value=dt, pk=123456)))
+
+    def test_signed(self):
+        cursor = serializers.to_cursor(value=(True, 'a'), pk=1, signed=True)
+        self.assertEqual(
+            serializers.from_cursor(cursor, signed=True),
+            {'value': (True, 'a'), 'pk': 1})
+        tampered = serializers.to_cursor(value=(True, 'b'), pk=1)
+        tampered += cursor[len(tampered):]
+        with self.assertRaises(serializers.InvalidPage):
+            serializers.from_cursor(tampered, signed=True)
+        with self.assertRaises(serializers.InvalidPage):
+            serializers.from_cursor(
+                serializers.to_cursor(value=(True, 'a'), pk=1), signed=True)
+        with override_settings(SECRET_KEY='foo'):
+            with self.assertRaises(serializers.InvalidPage):
+                serializers.from_cursor(cursor, signed=True)
+
+    def test_bad_cursor(self):
+        cursor = serializers.to_cursor(value=('abc', 1), pk=1)
+        for bad in ('*', 'AQ', 'Ag', cursor[:-2], cursor + 'AA', 'A' * 2000):
+            with self.assertRaises(serializers.InvalidPage):
+                serializers.from_cursor(bad)
+        with self.assertRaises(TypeError):
+            serializers.to_cursor(value=(object(),))
+
+    def test_paginate(self):
+        date = timezone.now()
+        for i in range(25):
+            Article.objects.create(
+                title="%s" % i, date=date,
+                date_unique=date + datetime.timedelta(seconds=i),
+                is_pinned=i % 3 == 0, is_sticky=i % 4 == 0)
+        articles = list(Article.objects.all().order_by(
+            '-is_pinned', '-is_sticky', '-date', '-pk'))
+        paginator = SeekPaginator(
+            Article.objects.all(), per_page=10,
+            lookup_field=('-is_pinned', '-is_sticky', '-date'))
+        page = paginator.page(**serializers.from_cursor(''))
+        self.assertListEqual(list(page), articles[:10])
+        cursor = serializers.to_cursor(**page.next_page())
+        page = paginator.page(**serializers.from_cursor(cursor))
+        self.assertListEqual(list(page), articles[10:20])
+
+
 class PaginatorViewTest(TestCase):
 
     def setUp(self):